@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, Future, wait, \
+    FIRST_COMPLETED
+from pancake_stack import PancakeStack
+from a_star import a_star
+from uniform_cost import uniform_cost
+from greedy_best_first import greedy_best_first
+from weighted_a_star import weighted_a_star
+from ida_star import ida_star
+from bidirectional import bidirectional_a_star, bidirectional_uniform_cost
+from solution_table import solve_with_table, DEFAULT_DIRECTORY
+from move_list import replay
+from flip_cost import FlipCost, LinearFlipCost
+from main import convert_to_cake, convert_to_burnt_cake, make_heuristic, \
+    HEURISTICS
+from typing import Callable, Dict, List, Optional, Set, TextIO
+
+# The solvers that can be picked from the command line.
+SOLVERS: Dict[str, Callable] = {
+    'a_star': a_star,
+    'uniform_cost': uniform_cost,
+    'greedy_best_first': greedy_best_first,
+    'weighted_a_star': weighted_a_star,
+    'ida_star': ida_star,
+    'bidirectional_a_star': bidirectional_a_star,
+    'bidirectional_uniform_cost': bidirectional_uniform_cost,
+}
+# The number of stacks handed out per worker before waiting on results.
+PENDING_PER_WORKER: int = 4
+
+
+def solve_line(line_number: int, line: str, algorithm: str,
+               table_directory: Optional[str], burnt: bool = False,
+               cost_model: Optional[FlipCost] = None,
+               heuristic: Optional[str] = None) -> str:
+    """
+    Solves the stack on one line of input.
+    :param line_number: The (1-based) number of the line in the input.
+    :param line: The line of input, a comma separated list of integers.
+    :param algorithm: The name of the solver to use.
+    :param table_directory: The directory to look for solution tables in, or
+    None to always search.
+    :param burnt: Whether the line is a stack of burnt pancakes, with the
+    pancakes whose burnt side is facing up given as negative numbers.
+    :param cost_model: The cost of flips, or None for the default.
+    :param heuristic: The name of the heuristic to use for plain stacks (see
+    main.make_heuristic), or None for the default.
+    :return: The result as a line of JSON.
+    """
+    result: Dict = {'line': line_number}
+    convert: Callable[[str, Optional[FlipCost]], Optional[PancakeStack]] = \
+        convert_to_burnt_cake if burnt else convert_to_cake
+    try:
+        initial_cake: Optional[PancakeStack] = convert(line, cost_model)
+    except ValueError:
+        initial_cake = None
+    if initial_cake is None:
+        result['error'] = 'Not a valid stack: {}'.format(line.strip())
+        return json.dumps(result)
+
+    goal_cake: PancakeStack = initial_cake.__class__(
+        range(len(initial_cake), 0, -1), -1)
+    result['stack'] = list(initial_cake.get_data())
+    # Only the flips are sent back, so the solvers never need to keep the
+    # states themselves. A solver failing on one stack only fails that
+    # stack's line, not the rest of the batch.
+    try:
+        if heuristic is not None:
+            initial_cake = initial_cake.with_heuristic(
+                make_heuristic(heuristic, len(initial_cake)))
+        if table_directory is None:
+            flips: Optional[List[int]] = SOLVERS[algorithm](
+                initial_cake, goal_cake, compact=True)
+        else:
+            flips = solve_with_table(initial_cake, goal_cake,
+                                     SOLVERS[algorithm], table_directory,
+                                     compact=True)
+    except Exception as error:
+        result['error'] = 'Solver failed: {!r}'.format(error)
+        return json.dumps(result)
+    if flips is None:
+        result['error'] = 'No solution'
+    else:
+        result['flips'] = flips
+        last_cake: PancakeStack = initial_cake
+        for last_cake in replay(initial_cake, flips):  # type: PancakeStack
+            pass
+        result['cost'] = last_cake.cost_to_self() - \
+            initial_cake.cost_to_self()
+    return json.dumps(result)
+
+
+def solve_all(lines: TextIO, output: TextIO, algorithm: str,
+              workers: int, table_directory: Optional[str] = None,
+              burnt: bool = False,
+              cost_model: Optional[FlipCost] = None,
+              heuristic: Optional[str] = None) -> None:
+    """
+    Solves every stack in the input over a pool of worker processes, writing
+    each result as soon as it is done. Results are written in the order they
+    finish in, not the order of the input, and only a few stacks per worker
+    are read ahead so the input can be streamed.
+    :param lines: The input, one stack per line. Blank lines are skipped.
+    :param output: Where to write the results, one line of JSON per stack.
+    :param algorithm: The name of the solver to use.
+    :param workers: The number of worker processes, at least 1.
+    :param table_directory: The directory to look for solution tables in, or
+    None to always search.
+    :param burnt: Whether the stacks are stacks of burnt pancakes.
+    :param cost_model: The cost of flips, or None for the default.
+    :param heuristic: The name of the heuristic to use for plain stacks (see
+    main.make_heuristic), or None for the default.
+    :return: None.
+    """
+    # The line number of each stack being solved.
+    line_numbers: Dict[Future, int] = {}
+
+    def write_done(done: Set[Future]) -> None:
+        """
+        Writes the results of the given finished stacks. A stack whose worker
+        failed (for example by running out of memory) gets an error line.
+        :param done: The finished stacks.
+        :return: None.
+        """
+        for future in done:  # type: Future
+            line_number: int = line_numbers.pop(future)
+            try:
+                output.write(future.result() + '\n')
+            except Exception as error:
+                output.write(json.dumps(
+                    {'line': line_number,
+                     'error': 'Solver failed: {!r}'.format(error)}) + '\n')
+        output.flush()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Set[Future] = set()
+        for line_number, line in enumerate(lines, 1):  # type: int, str
+            if not line.strip():
+                continue
+            future: Future = executor.submit(solve_line, line_number, line,
+                                             algorithm, table_directory,
+                                             burnt, cost_model, heuristic)
+            line_numbers[future] = line_number
+            pending.add(future)
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write_done(done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write_done(done)
+
+
+def positive_int(text: str) -> int:
+    """
+    Parses a command line argument that must be a whole number of at least 1,
+    such as a number of worker processes.
+    :param text: The argument.
+    :return: The number.
+    """
+    try:
+        number: int = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            '{!r} is not a whole number'.format(text))
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            'must be at least 1, not {}'.format(number))
+    return number
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+    :param arguments: The command line arguments, without the program name.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Solves many pancake stacks in parallel. Each line of the '
+                    'input is a stack in the same format the interactive '
+                    'solver takes, for example: 3, 1, 2. Each line of the '
+                    'output is the solution to one stack as JSON.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='File to read stacks from, - for stdin '
+                             '(the default).')
+    parser.add_argument('-o', '--output', default='-',
+                        help='File to write solutions to, - for stdout '
+                             '(the default).')
+    parser.add_argument('-a', '--algorithm', default='a_star',
+                        choices=sorted(SOLVERS),
+                        help='The solver to use (default: a_star).')
+    parser.add_argument('-w', '--workers', type=positive_int,
+                        default=os.cpu_count(),
+                        help='The number of worker processes (default: the '
+                             'number of CPUs).')
+    parser.add_argument('-t', '--tables', nargs='?', const=DEFAULT_DIRECTORY,
+                        default=None, metavar='DIRECTORY',
+                        help='Look small stacks up in the solution tables '
+                             'built by solution_table.py instead of '
+                             'searching. The directory defaults to {}.'
+                             .format(DEFAULT_DIRECTORY))
+    parser.add_argument('-b', '--burnt', action='store_true',
+                        help='Solve stacks of burnt pancakes, where a '
+                             'negative number is a pancake with its burnt '
+                             'side facing up.')
+    parser.add_argument('-c', '--flip-cost', type=int, nargs=2,
+                        default=None, metavar=('FIXED', 'PER_PANCAKE'),
+                        help='Make a flip cost FIXED plus PER_PANCAKE for '
+                             'every pancake it moves, instead of 20 plus the '
+                             'size of the stack.')
+    parser.add_argument('-H', '--heuristic', default=None,
+                        choices=HEURISTICS,
+                        help='The heuristic for plain stacks (default: gap). '
+                             'pdb is a pattern database, built and saved the '
+                             'first time a stack of its size is solved.')
+    args: argparse.Namespace = parser.parse_args(arguments)
+    if args.burnt and args.heuristic is not None:
+        parser.error('-H/--heuristic is only for plain stacks')
+    return args
+
+
+if __name__ == "__main__":
+    args: argparse.Namespace = parse_arguments(sys.argv[1:])
+    input_file: TextIO = sys.stdin if args.input == '-' \
+        else open(args.input)
+    output_file: TextIO = sys.stdout if args.output == '-' \
+        else open(args.output, 'w')
+    try:
+        solve_all(input_file, output_file, args.algorithm, args.workers,
+                  args.tables, args.burnt,
+                  None if args.flip_cost is None
+                  else LinearFlipCost(*args.flip_cost), args.heuristic)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
@@ -0,0 +1,248 @@
+import argparse
+import csv
+import json
+import random
+import sys
+from pancake_stack import PancakeStack
+from search_stats import SearchStats
+from batch import SOLVERS
+from typing import Any, Dict, List, Tuple
+
+# The solvers benchmarked when none are asked for.
+DEFAULT_SOLVERS: List[str] = ['a_star', 'uniform_cost', 'ida_star',
+                              'bidirectional_a_star',
+                              'bidirectional_uniform_cost']
+# The largest stacks the uninformed solvers are run on. Past these they take
+# minutes per stack.
+MAX_SIZES: Dict[str, int] = {'uniform_cost': 8,
+                             'bidirectional_uniform_cost': 10}
+# How much slower (as a fraction) a solver may get before it is reported as
+# a regression.
+DEFAULT_TOLERANCE: float = 0.25
+# Totals faster than this (in seconds) are too noisy to compare.
+MIN_SECONDS: float = 0.01
+# The columns of the report, in order.
+COLUMNS: List[str] = ['solver', 'size', 'index', 'stack', 'cost', 'seconds',
+                      'expanded', 'generated', 'peak_frontier', 'peak_memory']
+
+
+def make_stacks(seed: int, size: int, count: int) -> List[List[int]]:
+    """
+    Creates random stacks. The same seed, size and count always give the same
+    stacks, and the stacks of one size do not depend on the other sizes run.
+    :param seed: The seed for the random stacks.
+    :param size: The number of pancakes in each stack.
+    :param count: The number of stacks to create.
+    :return: The stacks.
+    """
+    generator: random.Random = random.Random(seed * 1000 + size)
+    stacks: List[List[int]] = []
+    for _ in range(count):  # type: int
+        stack: List[int] = list(range(1, size + 1))
+        generator.shuffle(stack)
+        stacks.append(stack)
+    return stacks
+
+
+def run_one(solver: str, stack: List[int], track_memory: bool) -> \
+        Dict[str, Any]:
+    """
+    Solves one stack with one solver.
+    :param solver: The name of the solver.
+    :param stack: The stack to solve.
+    :param track_memory: Whether or not to also measure peak memory. That
+    takes a second, slower run, so the timing is not affected.
+    :return: The measurements.
+    """
+    initial_state: PancakeStack = PancakeStack(stack, 0)
+    goal_state: PancakeStack = PancakeStack(range(len(stack), 0, -1), -1)
+    stats: SearchStats = SearchStats()
+    solution = SOLVERS[solver](initial_state, goal_state, stats=stats)
+    peak_memory = None
+    if track_memory:
+        memory_stats: SearchStats = SearchStats(track_memory=True)
+        SOLVERS[solver](initial_state, goal_state, stats=memory_stats)
+        peak_memory = memory_stats.peak_memory
+    return {
+        'stack': ','.join(str(pancake) for pancake in stack),
+        'cost': None if solution is None else
+        solution[1].cost_to_self() - initial_state.cost_to_self(),
+        'seconds': stats.timings['total'],
+        'expanded': stats.expanded,
+        'generated': stats.generated,
+        'peak_frontier': stats.peak_frontier,
+        'peak_memory': peak_memory,
+    }
+
+
+def run_benchmark(solvers: List[str], sizes: List[int], count: int,
+                  seed: int, track_memory: bool) -> List[Dict[str, Any]]:
+    """
+    Runs every solver on the same random stacks of every size.
+    :param solvers: The names of the solvers to run.
+    :param sizes: The stack sizes to run.
+    :param count: The number of stacks of each size.
+    :param seed: The seed for the random stacks.
+    :param track_memory: Whether or not to also measure peak memory.
+    :return: One row of measurements per solver and stack.
+    """
+    rows: List[Dict[str, Any]] = []
+    for size in sizes:  # type: int
+        stacks: List[List[int]] = make_stacks(seed, size, count)
+        for solver in solvers:  # type: str
+            if size > MAX_SIZES.get(solver, size):
+                continue
+            for index, stack in enumerate(stacks):  # type: int, List[int]
+                row: Dict[str, Any] = {'solver': solver, 'size': size,
+                                       'index': index}
+                row.update(run_one(solver, stack, track_memory))
+                rows.append(row)
+                print('{solver:>27} {size:>3} #{index:<3} '
+                      '{seconds:>9.4f}s {expanded:>9} expanded'.format(**row),
+                      file=sys.stderr)
+    return rows
+
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Totals the measurements for each solver and size.
+    :param rows: The rows of measurements.
+    :return: The totals, keyed by "solver/size".
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+    for row in rows:  # type: Dict[str, Any]
+        totals: Dict[str, float] = summary.setdefault(
+            '{}/{}'.format(row['solver'], row['size']),
+            {'seconds': 0.0, 'expanded': 0, 'peak_memory': 0})
+        totals['seconds'] += row['seconds']
+        totals['expanded'] += row['expanded']
+        totals['peak_memory'] = max(totals['peak_memory'],
+                                    row['peak_memory'] or 0)
+    return summary
+
+
+def compare(summary: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """
+    Compares a summary against a baseline summary. Time and memory may grow
+    by the tolerance before they count as a regression, and times under
+    MIN_SECONDS are not compared at all. The number of states expanded is
+    deterministic, so any growth counts.
+    :param summary: The summary of this run.
+    :param baseline: The summary of the baseline run.
+    :param tolerance: The fraction time and memory may grow by.
+    :return: A description of every regression found.
+    """
+    regressions: List[str] = []
+    for key, totals in sorted(summary.items()):  # type: str, Dict
+        if key not in baseline:
+            continue
+        before: Dict[str, float] = baseline[key]
+        checks: List[Tuple[str, float]] = [('seconds', tolerance),
+                                           ('expanded', 0.0),
+                                           ('peak_memory', tolerance)]
+        if max(before['seconds'], totals['seconds']) < MIN_SECONDS:
+            checks = checks[1:]
+        for measure, allowed in checks:  # type: str, float
+            if before.get(measure) and \
+                    totals[measure] > before[measure] * (1 + allowed):
+                regressions.append('{}: {} went from {} to {}'.format(
+                    key, measure, before[measure], totals[measure]))
+    return regressions
+
+
+def write_report(path: str, report: Dict[str, Any]) -> None:
+    """
+    Writes the report to a file, as CSV if the file name ends in .csv and as
+    JSON otherwise. Only the JSON report can be used as a baseline.
+    :param path: The file to write to.
+    :param report: The report.
+    :return: None.
+    """
+    with open(path, 'w', newline='') as file:
+        if path.endswith('.csv'):
+            writer: csv.DictWriter = csv.DictWriter(file, COLUMNS)
+            writer.writeheader()
+            writer.writerows(report['results'])
+        else:
+            json.dump(report, file, indent=2)
+
+
+def parse_sizes(text: str) -> List[int]:
+    """
+    Parses stack sizes given as a comma separated list of sizes and ranges,
+    for example: 5-10,12,14.
+    :param text: The sizes.
+    :return: The sizes as a list.
+    """
+    sizes: List[int] = []
+    for part in text.split(','):  # type: str
+        if '-' in part:
+            low, high = part.split('-')
+            sizes.extend(range(int(low), int(high) + 1))
+        else:
+            sizes.append(int(part))
+    return sizes
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+    :param arguments: The command line arguments, without the program name.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the pancake solvers on seeded random stacks.')
+    parser.add_argument('-s', '--sizes', type=parse_sizes,
+                        default=parse_sizes('5-14'),
+                        help='Stack sizes, e.g. 5-10,12 (default: 5-14).')
+    parser.add_argument('-n', '--count', type=int, default=5,
+                        help='Stacks per size (default: 5).')
+    parser.add_argument('--seed', type=int, default=131,
+                        help='Seed for the random stacks (default: 131).')
+    parser.add_argument('--solvers', nargs='+', default=DEFAULT_SOLVERS,
+                        choices=sorted(SOLVERS), metavar='SOLVER',
+                        help='Solvers to run (default: {}). Choices: {}.'
+                        .format(' '.join(DEFAULT_SOLVERS),
+                                ', '.join(sorted(SOLVERS))))
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the second run that measures peak memory.')
+    parser.add_argument('-o', '--output', default='benchmark.json',
+                        help='Report file, .json or .csv '
+                             '(default: benchmark.json).')
+    parser.add_argument('-b', '--baseline',
+                        help='JSON report to compare against. Exits with '
+                             'status 1 on a regression.')
+    parser.add_argument('-t', '--tolerance', type=float,
+                        default=DEFAULT_TOLERANCE,
+                        help='Fraction time and memory may grow by before '
+                             'it is a regression (default: {}).'
+                        .format(DEFAULT_TOLERANCE))
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    args: argparse.Namespace = parse_arguments(sys.argv[1:])
+    results: List[Dict[str, Any]] = run_benchmark(
+        args.solvers, args.sizes, args.count, args.seed, not args.no_memory)
+    benchmark_report: Dict[str, Any] = {
+        'config': {'sizes': args.sizes, 'count': args.count,
+                   'seed': args.seed, 'solvers': args.solvers},
+        'results': results,
+        'summary': summarize(results),
+    }
+    write_report(args.output, benchmark_report)
+    print('Wrote {}.'.format(args.output))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline_report: Dict[str, Any] = json.load(baseline_file)
+        found: List[str] = compare(benchmark_report['summary'],
+                                   baseline_report['summary'],
+                                   args.tolerance)
+        for regression in found:  # type: str
+            print('Regression: ' + regression)
+        if found:
+            sys.exit(1)
+        print('No regressions against {}.'.format(args.baseline))
@@ -0,0 +1,115 @@
+import time
+from cake_heap import CakeHeap
+from search_stats import SearchStats
+from typing import Callable, Dict, Hashable, Iterable, Optional, Set, \
+    Tuple, TypeVar
+
+# Any hashable search state.
+T = TypeVar('T', bound=Hashable)
+
+
+def best_first_search(initial_state: T,
+                      is_goal: Callable[[T], bool],
+                      successors: Callable[[T], Iterable[T]],
+                      step_cost: Callable[[T, T], int],
+                      heuristic: Callable[[T], int],
+                      g_weight: float = 1,
+                      h_weight: float = 1,
+                      frontier_type: Callable[[], CakeHeap] = CakeHeap,
+                      stats: Optional[SearchStats] = None,
+                      key: Optional[Callable[[T], Hashable]] = None) -> \
+        Optional[Tuple[Dict[Hashable, Hashable], T]]:
+    """
+    Generic best-first graph search. States are expanded in order of
+    g_weight * g + h_weight * h, where g is the cost of the cheapest known
+    path to a state and h is the heuristic estimate of the cost from the state
+    to a goal. Every search mode in this package is a configuration of this
+    function:
+
+    A*: g_weight = 1, h_weight = 1.
+    Uniform cost: g_weight = 1, h_weight = 0.
+    Greedy best-first: g_weight = 0, h_weight = 1.
+    Weighted A*: g_weight = 1, h_weight = 1 + epsilon.
+
+    :param initial_state: The state to start searching from.
+    :param is_goal: Determines whether or not a state is a goal.
+    :param successors: Gets the states reachable in one step from a state.
+    :param step_cost: Gets the cost of moving from a state (first argument) to
+    one of its successors (second argument).
+    :param heuristic: Gets the estimated cost from a state to a goal.
+    :param g_weight: The weight given to the path cost of a state.
+    :param h_weight: The weight given to the heuristic cost of a state.
+    :param frontier_type: Creates the priority queue used as the frontier.
+    Anything with the same methods as CakeHeap will do.
+    :param stats: Filled in with statistics about the search if given.
+    :param key: Gets a compact key for a state. If given, the closed set, the
+    path costs and the parent pointers are all kept by key, so states that
+    have left the frontier can be freed.
+    :return: A tuple containing: a dictionary where each key is a state (or
+    its key), and each value is that state's parent (or its key), and the goal
+    state. None is returned if no path is found.
+    """
+    key_of: Callable[[T], Hashable] = _same if key is None else key
+    frontier: CakeHeap = frontier_type()
+    visited: Set[Hashable] = set()
+    initial_key: Hashable = key_of(initial_state)
+    g_scores: Dict[Hashable, int] = {initial_key: 0}
+    path: Dict[Hashable, Optional[Hashable]] = {initial_key: None}
+    if stats is not None:
+        stats.start()
+    frontier.push(initial_state, h_weight * heuristic(initial_state))
+
+    # Timings are only taken when statistics are being collected.
+    started: float = 0.0
+    while not frontier.empty():
+        if stats is not None:
+            started = time.perf_counter()
+        current_state: T = frontier.pop()
+        current_key: Hashable = key_of(current_state)
+        visited.add(current_key)
+        if stats is not None:
+            stats.expand(current_state, len(frontier) + 1)
+        if is_goal(current_state):
+            if stats is not None:
+                stats.finish()
+            return path, current_state
+        current_cost: int = g_scores[current_key]
+        if stats is not None:
+            stats.add_time('frontier', started)
+            started = time.perf_counter()
+        children: Iterable[T] = successors(current_state)
+        if stats is not None:
+            stats.add_time('successors', started)
+            started = time.perf_counter()
+        for child in children:  # type: T
+            if stats is not None:
+                stats.generated += 1
+            child_key: Hashable = key_of(child)
+            if child_key in visited:
+                continue
+            child_cost: int = current_cost + step_cost(current_state, child)
+            best_cost: Optional[int] = g_scores.get(child_key)
+            if best_cost is None or child_cost < best_cost:
+                if stats is not None and best_cost is not None:
+                    stats.decreased_keys += 1
+                g_scores[child_key] = child_cost
+                frontier.push(child, g_weight * child_cost +
+                              h_weight * heuristic(child))
+                path[child_key] = current_key
+        # The time spent on the children covers scoring them (step costs,
+        # heuristics and the bookkeeping of the best costs), not only
+        # queueing them.
+        if stats is not None:
+            stats.add_time('children', started)
+    if stats is not None:
+        stats.finish()
+    return None
+
+
+def _same(state: T) -> T:
+    """
+    The default key function: every state is its own key.
+    :param state: The state.
+    :return: The state.
+    """
+    return state
@@ -0,0 +1,250 @@
+from pancake_stack import PancakeStack
+from burnt_pancake_stack import BurntPancakeStack
+from burnt_pancake_heuristics import BURNT
+from pancake_heuristics import PancakeHeuristic
+from cake_heap import CakeHeap
+from search_stats import SearchStats
+from typing import Dict, Tuple, List, Optional, Set, Union
+
+# Cost used before any path between the two searches has been found.
+INFINITY: float = float('inf')
+
+
+def bidirectional_a_star(initial_state: PancakeStack,
+                         goal_state: PancakeStack,
+                         heuristic: Optional[PancakeHeuristic] = None,
+                         stats: Optional[SearchStats] = None,
+                         compact: bool = False) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
+    """
+    Given an initial state and a goal state finds a series of flips to get
+    from the initial state to the goal using bidirectional a*. One a* search
+    grows from the initial state towards the goal and another grows from the
+    goal towards the initial state until they meet.
+    :param initial_state: The initial state to get to the goal from.
+    :param goal_state: The goal state to get to from the initial state.
+    :param heuristic: The heuristic to guide both searches with. Must be
+    consistent. Defaults to the heuristic the initial state was created with.
+    :param stats: Filled in with statistics about the search if given. The
+    frontier size is that of both frontiers together.
+    :param compact: If true the solution is returned as a list of flips (see
+    move_list) instead of a dictionary of states.
+    :return: A tuple containing: a dictionary where each key is a state, and
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
+    """
+    return _bidirectional(initial_state, goal_state, heuristic, 1, stats,
+                          compact)
+
+
+def bidirectional_uniform_cost(initial_state: PancakeStack,
+                               goal_state: PancakeStack,
+                               stats: Optional[SearchStats] = None,
+                               compact: bool = False) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
+    """
+    Given an initial state and a goal state finds a series of flips to get
+    from the initial state to the goal using bidirectional uniform cost
+    search. One uniform cost search grows from the initial state towards the
+    goal and another grows from the goal towards the initial state until they
+    meet.
+    :param initial_state: The initial state to get to the goal from.
+    :param goal_state: The goal state to get to from the initial state.
+    :param stats: Filled in with statistics about the search if given. The
+    frontier size is that of both frontiers together.
+    :param compact: If true the solution is returned as a list of flips (see
+    move_list) instead of a dictionary of states.
+    :return: A tuple containing: a dictionary where each key is a state, and
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
+    """
+    return _bidirectional(initial_state, goal_state, None, 0, stats,
+                          compact)
+
+
+class _Search:
+    """
+    One direction of a bidirectional search. States are keyed by their bytes
+    key in the original labelling so the two directions can be compared.
+    """
+
+    def __init__(self, root: PancakeStack, relabel: Optional[bytes],
+                 h_weight: int):
+        """
+        Initializes the search.
+        :param root: The state to grow the search from.
+        :param relabel: The bytes.translate table mapping the labelling the
+        states are in back to the original labelling, or None if they already
+        use the original labelling.
+        :param h_weight: The weight given to the heuristic cost of a state.
+        """
+        self.frontier: CakeHeap = CakeHeap()
+        self.visited: Set[bytes] = set()
+        self.g_scores: Dict[bytes, int] = {}
+        self.parents: Dict[bytes, Optional[bytes]] = {}
+        self._relabel: Optional[bytes] = relabel
+        self._h_weight: int = h_weight
+        root_key: bytes = self.key(root)
+        self.g_scores[root_key] = 0
+        self.parents[root_key] = None
+        self.frontier.push(root, h_weight * root.heuristic_cost())
+
+    def key(self, state: PancakeStack) -> bytes:
+        """
+        Gets the key of a state in the original labelling.
+        :param state: The state to get the key of.
+        :return: The key of the state.
+        """
+        if self._relabel is None:
+            return state.get_key()
+        return state.get_key().translate(self._relabel)
+
+    def expand(self, other: '_Search', best: Tuple[float, Optional[bytes]],
+               stats: Optional[SearchStats]) -> Tuple[float, Optional[bytes]]:
+        """
+        Expands the cheapest state on the frontier.
+        :param other: The search running in the other direction.
+        :param best: The cost of the cheapest path found so far and the key of
+        the state where the two searches met on it.
+        :param stats: Filled in with statistics about the search if given.
+        :return: The (possibly improved) cheapest path cost and meeting key.
+        """
+        current_state: PancakeStack = self.frontier.pop()
+        current_key: bytes = self.key(current_state)
+        self.visited.add(current_key)
+        current_cost: int = self.g_scores[current_key]
+        children: List[PancakeStack] = current_state.children()
+        if stats is not None:
+            stats.expand(current_state,
+                         len(self.frontier) + len(other.frontier) + 1)
+            stats.generated += len(children)
+        for child in children:  # type: PancakeStack
+            child_key: bytes = self.key(child)
+            if child_key in self.visited:
+                continue
+            child_cost: int = current_cost + current_state.step_cost(child)
+            best_cost: Optional[int] = self.g_scores.get(child_key)
+            if best_cost is None or child_cost < best_cost:
+                if stats is not None and best_cost is not None:
+                    stats.decreased_keys += 1
+                self.g_scores[child_key] = child_cost
+                self.parents[child_key] = current_key
+                self.frontier.push(child, child_cost + self._h_weight *
+                                   child.heuristic_cost())
+                other_cost: Optional[int] = other.g_scores.get(child_key)
+                if other_cost is not None and \
+                        child_cost + other_cost < best[0]:
+                    best = (child_cost + other_cost, child_key)
+        return best
+
+    def path_to_root(self, key: bytes) -> List[bytes]:
+        """
+        Gets the keys on the path from the given state back to the root.
+        :param key: The key of the state to start from.
+        :return: The keys from the given state to the root, inclusive.
+        """
+        keys: List[bytes] = []
+        current: Optional[bytes] = key
+        while current is not None:
+            keys.append(current)
+            current = self.parents[current]
+        return keys
+
+
+def _bidirectional(initial_state: PancakeStack,
+                   goal_state: PancakeStack,
+                   heuristic: Optional[PancakeHeuristic],
+                   h_weight: int,
+                   stats: Optional[SearchStats],
+                   compact: bool) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
+    """
+    Runs a bidirectional best-first search where both directions order their
+    frontier by g + h_weight * h.
+
+    The heuristics only estimate the cost to the sorted stack, so the backward
+    search runs on relabelled stacks: every pancake is renamed so that the
+    initial state becomes the sorted stack. Relabelling does not change which
+    flips are needed, so the backward search can use the same heuristic, and
+    its keys are translated back before the two searches are compared. For
+    burnt pancakes a pancake turned over is renamed to the new name turned
+    over, so that relabelling still commutes with flips.
+
+    :param initial_state: The initial state to get to the goal from.
+    :param goal_state: The goal state to get to from the initial state.
+    :param heuristic: The heuristic to guide both searches with, or None for
+    the heuristic of the initial state.
+    :param h_weight: The weight given to the heuristic cost (0 or 1).
+    :param stats: Filled in with statistics about the search if given.
+    :param compact: If true the solution is returned as a list of flips (see
+    move_list) instead of a dictionary of states.
+    :return: A tuple containing: a dictionary where each key is a state, and
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
+    """
+    if heuristic is not None:
+        initial_state = initial_state.with_heuristic(heuristic)
+    if stats is not None:
+        stats.start()
+    if initial_state == goal_state:
+        if stats is not None:
+            stats.finish()
+        return [] if compact else ({initial_state: None}, initial_state)
+
+    initial_key: bytes = initial_state.get_key()
+    goal_key: bytes = goal_state.get_key()
+    to_backward: bytearray = bytearray(range(256))
+    to_forward: bytearray = bytearray(range(256))
+    burnt: bool = isinstance(initial_state, BurntPancakeStack)
+    for original, relabelled in zip(initial_key, goal_key):  # type: int, int
+        to_backward[original] = relabelled
+        to_forward[relabelled] = original
+        if burnt:
+            to_backward[original ^ BURNT] = relabelled ^ BURNT
+            to_forward[relabelled ^ BURNT] = original ^ BURNT
+    backward_root: PancakeStack = initial_state.__class__(
+        goal_key.translate(to_backward), 0, initial_state.heuristic(),
+        cost_model=initial_state.cost_model())
+
+    forward: _Search = _Search(initial_state, None, h_weight)
+    backward: _Search = _Search(backward_root, bytes(to_forward), h_weight)
+    flip_cost: int = initial_state.flip_cost()
+    best: Tuple[float, Optional[bytes]] = (INFINITY, None)
+
+    while not forward.frontier.empty() and not backward.frontier.empty():
+        forward_min: int = forward.frontier.min_cost()
+        backward_min: int = backward.frontier.min_cost()
+        # Every cheaper path would still have a state on each frontier whose
+        # priority is at most its cost. Without a heuristic the cheapest such
+        # path also needs at least one more flip between the two frontiers.
+        lower_bound: float = max(forward_min, backward_min)
+        if h_weight == 0:
+            lower_bound = max(lower_bound,
+                              forward_min + backward_min + flip_cost)
+        if best[0] <= lower_bound:
+            break
+        if len(forward.frontier) <= len(backward.frontier):
+            best = forward.expand(backward, best, stats)
+        else:
+            best = backward.expand(forward, best, stats)
+
+    if stats is not None:
+        stats.finish()
+    if best[1] is None:
+        return None
+    keys: List[bytes] = list(reversed(forward.path_to_root(best[1]))) + \
+        backward.path_to_root(best[1])[1:]
+    moves: List[int] = [PancakeStack.flip_between(parent_key, child_key)
+                        for parent_key, child_key in zip(keys, keys[1:])]
+    if compact:
+        return moves
+    path: Dict[PancakeStack, PancakeStack] = {initial_state: None}
+    current: PancakeStack = initial_state
+    for move in moves:  # type: int
+        child: PancakeStack = current.flip(move)
+        path[child] = current
+        current = child
+    return path, current
@@ -0,0 +1,146 @@
+from pancake_stack import PancakeStack
+from typing import Optional, List, Dict
+
+
+class BucketQueue:
+    """
+    BucketQueue is a priority queue for small non-negative integer costs
+    (Dial's algorithm). There is one bucket per cost, and each bucket is a
+    dictionary of the items with that cost, so pushing, removing and changing
+    the cost of an item all take constant time. Popping scans forward from
+    the lowest cost seen to the first non-empty bucket, which is also constant
+    time on average when, as in a* and uniform cost search, the costs popped
+    never decrease by much.
+
+    It has the same methods as CakeHeap, so either can be used as the frontier
+    of a search. Costs must be ints: weighted a* produces float priorities and
+    needs a CakeHeap. Items with the same cost are popped most recently pushed
+    first, which makes searches favour the deeper of two equally good states.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the buckets.
+        """
+        self._buckets: List[Dict[PancakeStack, PancakeStack]] = []
+        self._costs: Dict[PancakeStack, int] = {}
+        # No bucket below this index holds any items.
+        self._minimum: int = 0
+
+    def push(self, to_push: PancakeStack, cost: int) -> None:
+        """
+        Pushes the given item onto the BucketQueue with a cost. If an equal
+        item is already in the BucketQueue it is replaced by the given item
+        and cost.
+        :param to_push: The item to push onto the BucketQueue.
+        :param cost: The cost to associated with the item. Must be a
+        non-negative int.
+        :return: None.
+        """
+        old_cost: Optional[int] = self._costs.get(to_push)
+        if old_cost is not None:
+            del self._buckets[old_cost][to_push]
+        self._costs[to_push] = cost
+        if cost >= len(self._buckets):
+            self._buckets.extend(
+                {} for _ in range(cost + 1 - len(self._buckets)))
+        self._buckets[cost][to_push] = to_push
+        if cost < self._minimum:
+            self._minimum = cost
+
+    def pop(self) -> Optional[PancakeStack]:
+        """
+        Pops the item with the lowest cost off of the BucketQueue.
+        :return: The item in the BucketQueue with the lowest cost. If empty
+        returns None.
+        """
+        if self.empty():
+            return None
+        bucket: Dict[PancakeStack, PancakeStack] = self.__lowest_bucket()
+        key, item = bucket.popitem()
+        del self._costs[key]
+        return item
+
+    def min_cost(self) -> Optional[int]:
+        """
+        Gets the lowest cost in the BucketQueue without popping its item.
+        :return: The lowest cost in the BucketQueue. If empty returns None.
+        """
+        if self.empty():
+            return None
+        self.__lowest_bucket()
+        return self._minimum
+
+    def cost(self, item: PancakeStack) -> Optional[int]:
+        """
+        Gets the cost of an item in the BucketQueue.
+        :param item: The item to get the cost of.
+        :return: The cost of the item, or None if it is not in the
+        BucketQueue.
+        """
+        return self._costs.get(item)
+
+    def remove(self, to_remove: PancakeStack) -> None:
+        """
+        Removes the item given from the BucketQueue if it exists.
+        :param to_remove: The item to remove.
+        :return: None.
+        """
+        cost: Optional[int] = self._costs.pop(to_remove, None)
+        if cost is not None:
+            del self._buckets[cost][to_remove]
+
+    def empty(self) -> bool:
+        """
+        Determines whether or not the BucketQueue is empty.
+        :return: A boolean value -- true if the BucketQueue is empty.
+        """
+        return len(self._costs) == 0
+
+    def __lowest_bucket(self) -> Dict[PancakeStack, PancakeStack]:
+        """
+        Moves the lowest cost seen forward to the first non-empty bucket. Must
+        not be called when the BucketQueue is empty.
+        :return: The first non-empty bucket.
+        """
+        while not self._buckets[self._minimum]:
+            self._minimum += 1
+        return self._buckets[self._minimum]
+
+    def __len__(self) -> int:
+        """
+        Gets the number of items in the BucketQueue.
+        :return: The number of items in the BucketQueue.
+        """
+        return len(self._costs)
+
+    def __contains__(self, to_find: PancakeStack) -> bool:
+        """
+        Determines if the given item is in the BucketQueue.
+        :param to_find: the item to find in the BucketQueue.
+        :return: A boolean value -- true if to_find is in the BucketQueue.
+        """
+        return to_find in self._costs
+
+    def __getitem__(self, to_get: PancakeStack) -> Optional[PancakeStack]:
+        """
+        Gets an item from the BucketQueue if it exists.
+        :param to_get: The item to get from the BucketQueue.
+        :return: The item if it is in the BucketQueue, None otherwise.
+        """
+        cost: Optional[int] = self._costs.get(to_get)
+        return None if cost is None else self._buckets[cost][to_get]
+
+    def __str__(self) -> str:
+        """
+        Produces a string output of the BucketQueue.
+        :return: The string output of the BucketQueue.
+        """
+        return 'BucketQueue({})'.format(self._costs)
+
+    def __repr__(self) -> str:
+        """
+        Produces a string representation of the BucketQueue object.
+        :return: The string representation of the BucketQueue object.
+        """
+        return 'BucketQueue({})'.format(self._costs)
@@ -0,0 +1,103 @@
+from pancake_heuristics import PancakeHeuristic
+from typing import Sequence, Tuple
+
+# Set in the byte of a pancake whose burnt side is facing up.
+BURNT: int = 0x80
+# The bytes.translate table that turns every pancake over.
+TURN_OVER: bytes = bytes(byte ^ BURNT for byte in range(256))
+# The signed size of the pancake stored in each byte: negative if the burnt
+# side is facing up.
+SIGNED: Tuple[int, ...] = tuple(-(byte ^ BURNT) if byte & BURNT else byte
+                                for byte in range(256))
+
+
+class BurntPancakeHeuristic(PancakeHeuristic):
+    """
+    Estimates the cost of sorting a stack of burnt pancakes. The stacks are
+    stored the way BurntPancakeStack stores them: one byte per pancake with
+    the BURNT bit set if the burnt side of the pancake is facing up. The goal
+    is the sorted stack with every burnt side facing down.
+    """
+
+    def flipped(self,
+                data: Sequence[int],
+                estimate: int,
+                index: int,
+                flip_cost: int) -> int:
+        """
+        Estimates the cost to the goal of the stack produced by flipping the
+        given stack at the given index, reusing the given stack's estimate
+        where possible. By default the estimate is calculated from scratch.
+        :param data: The stack before the flip.
+        :param estimate: The estimate for the stack before the flip.
+        :param index: The index of the lowest pancake flipped.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost for the stack after the flip.
+        """
+        return self.estimate(
+            bytes(data[:index]) + bytes(data[index:][::-1]).translate(
+                TURN_OVER),
+            flip_cost)
+
+
+class BurntGapHeuristic(BurntPancakeHeuristic):
+    """
+    The gap heuristic for burnt pancakes. Reading the stack from the bottom
+    with burnt side up pancakes counted as negative, a pancake forms a gap
+    with the one below it unless it is exactly one smaller (and the plate
+    counts as a pancake one larger than the largest one). Flipping a run of
+    pancakes reverses and negates it, which keeps every pair inside the run a
+    gap or not, so a flip can remove at most one gap. The only stack without
+    gaps is the goal.
+    """
+
+    def estimate(self, data: Sequence[int], flip_cost: int) -> int:
+        """
+        Estimates the cost to get from the given stack to the goal.
+        :param data: The stack to estimate the cost for.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost.
+        """
+        return BurntGapHeuristic.gaps(data) * flip_cost
+
+    def flipped(self,
+                data: Sequence[int],
+                estimate: int,
+                index: int,
+                flip_cost: int) -> int:
+        """
+        Estimates the cost to the goal of the stack produced by flipping the
+        given stack at the given index in constant time. Only the pair made
+        of the pancake below the spatula and the pancake above it changes:
+        the top pancake ends up, turned over, where the pancake at the index
+        was.
+        :param data: The stack before the flip.
+        :param estimate: The estimate for the stack before the flip.
+        :param index: The index of the lowest pancake flipped.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost for the stack after the flip.
+        """
+        below: int = SIGNED[data[index - 1]] if index else len(data) + 1
+        before: int = below - SIGNED[data[index]] != 1
+        after: int = below + SIGNED[data[-1]] != 1
+        return estimate + (after - before) * flip_cost
+
+    @staticmethod
+    def gaps(data: Sequence[int]) -> int:
+        """
+        Counts the gaps in the given stack.
+        :param data: The stack to count the gaps in.
+        :return: The number of gaps.
+        """
+        below: int = len(data) + 1
+        gaps: int = 0
+        for byte in data:  # type: int
+            pancake: int = SIGNED[byte]
+            if below - pancake != 1:
+                gaps += 1
+            below = pancake
+        return gaps
+
+
+# The heuristic used for burnt pancakes when no other heuristic is asked for.
+DEFAULT_BURNT_HEURISTIC: BurntPancakeHeuristic = BurntGapHeuristic()
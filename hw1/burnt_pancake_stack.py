@@ -0,0 +1,102 @@
+import permutation_rank
+from pancake_stack import PancakeStack
+from pancake_heuristics import PancakeHeuristic
+from burnt_pancake_heuristics import BURNT, TURN_OVER, SIGNED, \
+    DEFAULT_BURNT_HEURISTIC
+from flip_cost import FlipCost
+from typing import Sequence, Optional
+
+
+class BurntPancakeStack(PancakeStack):
+    """
+    A stack of burnt pancakes: every pancake has a burnt side, and a flip
+    turns the flipped pancakes over as well as reversing their order. The
+    goal is the sorted stack with every burnt side facing down.
+
+    Pancakes are given as signed sizes, negative if the burnt side is facing
+    up. Internally every pancake is still one byte, with the BURNT bit set if
+    the burnt side is facing up (which limits stacks to 127 pancakes), so the
+    searches, heuristics and keys work the same way as for PancakeStack.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, data: Sequence[int], cost_to_parent: int,
+                 heuristic: Optional[PancakeHeuristic] = None,
+                 heuristic_cost: Optional[int] = None,
+                 cost_model: Optional[FlipCost] = None,
+                 last_flip_cost: Optional[int] = None):
+        """
+        Initializes the stack of burnt pancakes.
+        :param data: The signed sizes of the pancakes, negative if the burnt
+        side is facing up, or a key returned by get_key. The 0th index must
+        be the bottom of the stack, and the (len(_data)-1)th index must be
+        the top of the stack. A ValueError is raised for pancakes too large to
+        store (127 is the largest).
+        :param cost_to_parent: The cost associated with the parent.
+        :param heuristic: The heuristic used to estimate the cost to the goal.
+        Children use the same heuristic. Defaults to the burnt gap heuristic.
+        :param heuristic_cost: The heuristic cost of this state if it is
+        already known. Calculated from scratch if not given.
+        :param cost_model: The cost of flips. Children use the same cost
+        model. Defaults to 20 plus the number of pancakes per flip.
+        :param last_flip_cost: The cost of the flip from the parent to this
+        state. Defaults to the cost of flipping the whole stack.
+        """
+        if not isinstance(data, bytes):
+            if any(abs(pancake) >= BURNT for pancake in data):
+                raise ValueError('Stacks of burnt pancakes are limited to '
+                                 '{} pancakes.'.format(BURNT - 1))
+            data = bytes(-pancake | BURNT if pancake < 0 else pancake
+                         for pancake in data)
+        super().__init__(
+            data, cost_to_parent,
+            DEFAULT_BURNT_HEURISTIC if heuristic is None else heuristic,
+            heuristic_cost, cost_model, last_flip_cost)
+
+    @staticmethod
+    def flip_key(key: bytes, index: int) -> bytes:
+        """
+        Gets the key of the stack produced by a flip.
+        :param key: The key of the stack before the flip.
+        :param index: The index of the lowest pancake to flip.
+        :return: The key of the stack after the flip.
+        """
+        return key[:index] + key[index:][::-1].translate(TURN_OVER)
+
+    def useful_flips(self) -> range:
+        """
+        Gets the flips that can change the stack. Every flip does, since
+        even the top pancake on its own gets turned over.
+        :return: The indices of the useful flips.
+        """
+        return range(len(self._data))
+
+    def get_data(self) -> tuple:
+        """
+        Gets the signed sizes of the pancakes, negative if the burnt side is
+        facing up.
+        :return: The signed sizes of the pancakes.
+        """
+        return tuple(SIGNED[byte] for byte in self._data)
+
+    def rank(self) -> int:
+        """
+        Gets the rank of this stack among all of the stacks of burnt pancakes
+        with the same number of pancakes, a single integer in 0..n!*2^n-1.
+        :return: The rank of this stack.
+        """
+        burnt_sides: int = 0
+        for byte in self._data:  # type: int
+            burnt_sides = burnt_sides << 1 | (byte & BURNT != 0)
+        return permutation_rank.rank(
+            [(byte & ~BURNT) - 1 for byte in self._data]) << \
+            len(self._data) | burnt_sides
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Gets the signed size of the pancake at the given index.
+        :param index:
+        :return: The signed size of the pancake at that index.
+        """
+        return SIGNED[self._data[index]]
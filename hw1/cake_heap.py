@@ -1,39 +1,49 @@
-import heapq
 from pancake_stack import PancakeStack
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 
 class CakeHeap:
     """
-    CakeHeap defines a wrapper around heapq that allows one to use
-    arbitrary objects of type T and specify the costs separately. Currently
-    each item and cost is wrapped in a tuple where the 0th element of the tuple
-    is the cost and the 1st element is the item. This is an implementation
-    detail given to help understand the code and is subject to change!
-
-    If a pancake with the same configuration is removed and then added
-    (replaced) with a  higher cost this implementation will not work! Luckily
-    I only need to be able to replace pancakes with versions that have lower
-    costs. Who would want to pay more for the same pancake anyways?
+    CakeHeap is an indexed binary heap that allows one to use arbitrary
+    hashable objects and specify the costs separately. Every item is stored in
+    a tuple of (cost, insertion order, item), and the position of each item in
+    the heap is kept in a dictionary. That means an item can be found, have
+    its cost changed (decrease-key) or be removed in O(log n) time, and the
+    heap never holds more than one entry per item.
+
+    Items with the same cost come out in the order they were pushed in, so
+    the item objects themselves are never compared.
     """
 
     def __init__(self) -> None:
         """
-        Initialize the underlying heapq.
+        Initialize the underlying heap.
         """
-        self._data: List = []
-        self._entries: Dict[PancakeStack, PancakeStack] = {}
-        heapq.heapify(self._data)
+        self._data: List[Tuple[int, int, PancakeStack]] = []
+        self._positions: Dict[PancakeStack, int] = {}
+        self._pushed: int = 0
 
     def push(self, to_push: PancakeStack, cost: int) -> None:
         """
-        Pushes the given item onto the CakeHeap with a cost.
+        Pushes the given item onto the CakeHeap with a cost. If an equal item
+        is already in the CakeHeap it is replaced by the given item and cost.
         :param to_push: The item to push onto the CakeHeap.
         :param cost: The cost to associated with the item.
         :return: None.
         """
-        self._entries[to_push] = to_push
-        heapq.heappush(self._data, (cost, to_push))
+        entry: Tuple[int, int, PancakeStack] = (cost, self._pushed, to_push)
+        self._pushed += 1
+        index: Optional[int] = self._positions.get(to_push)
+        if index is None:
+            self._data.append(entry)
+            self.__sift_up(len(self._data) - 1)
+        else:
+            old_entry: Tuple[int, int, PancakeStack] = self._data[index]
+            self._data[index] = entry
+            if entry < old_entry:
+                self.__sift_up(index)
+            else:
+                self.__sift_down(index)
 
     def pop(self) -> Optional[PancakeStack]:
         """
@@ -43,14 +53,31 @@ class CakeHeap:
         """
         if self.empty():
             return None
+        item: PancakeStack = self._data[0][2]
+        del self._positions[item]
+        last: Tuple[int, int, PancakeStack] = self._data.pop()
+        if self._data:
+            self._data[0] = last
+            self.__sift_down(0)
+        return item
+
+    def min_cost(self) -> Optional[int]:
+        """
+        Gets the lowest cost in the CakeHeap without popping its item.
+        :return: The lowest cost in the CakeHeap. If empty returns None.
+        """
+        if self.empty():
+            return None
+        return self._data[0][0]
 
-        item: PancakeStack = None
-        while item is None:
-            item = heapq.heappop(self._data)[1]  # type: PancakeStack
-            if item in self._entries:
-                del self._entries[item]
-                return item
-            item = None
+    def cost(self, item: PancakeStack) -> Optional[int]:
+        """
+        Gets the cost of an item in the CakeHeap.
+        :param item: The item to get the cost of.
+        :return: The cost of the item, or None if it is not in the CakeHeap.
+        """
+        index: Optional[int] = self._positions.get(item)
+        return None if index is None else self._data[index][0]
 
     def remove(self, to_remove: PancakeStack) -> None:
         """
@@ -58,15 +85,28 @@ class CakeHeap:
         :param to_remove: The item to remove.
         :return: None.
         """
-        if self.__contains__(to_remove):
-            del self._entries[to_remove]
+        index: Optional[int] = self._positions.pop(to_remove, None)
+        if index is None:
+            return
+        last: Tuple[int, int, PancakeStack] = self._data.pop()
+        if index < len(self._data):
+            self._data[index] = last
+            self.__sift_up(index)
+            self.__sift_down(self._positions[last[2]])
 
     def empty(self) -> bool:
         """
         Determines whether or not the CakeHeap is empty.
         :return: A boolean value -- true if the CakeHeap is empty.
         """
-        return len(self._entries) == 0
+        return len(self._data) == 0
+
+    def __len__(self) -> int:
+        """
+        Gets the number of items in the CakeHeap.
+        :return: The number of items in the CakeHeap.
+        """
+        return len(self._data)
 
     def __contains__(self, to_find: PancakeStack) -> bool:
         """
@@ -74,7 +114,7 @@ class CakeHeap:
         :param to_find: the item to find in the CakeHeap.
         :return: A boolean value -- true if to_find is in the CakeHeap.
         """
-        return to_find in self._entries
+        return to_find in self._positions
 
     def __getitem__(self, to_get: PancakeStack) -> Optional[PancakeStack]:
         """
@@ -82,7 +122,53 @@ class CakeHeap:
         :param to_get: The item to get from the CakeHeap.
         :return: The item if it is in the CakeHeap, None otherwise.
         """
-        return self._entries.get(to_get)
+        index: Optional[int] = self._positions.get(to_get)
+        return None if index is None else self._data[index][2]
+
+    def __sift_up(self, index: int) -> None:
+        """
+        Moves the entry at the given index up the heap until its parent is
+        not more expensive, updating the positions of every entry moved.
+        :param index: The index of the entry to move.
+        :return: None.
+        """
+        data: List[Tuple[int, int, PancakeStack]] = self._data
+        entry: Tuple[int, int, PancakeStack] = data[index]
+        while index > 0:
+            parent_index: int = (index - 1) >> 1
+            parent: Tuple[int, int, PancakeStack] = data[parent_index]
+            if not entry < parent:
+                break
+            data[index] = parent
+            self._positions[parent[2]] = index
+            index = parent_index
+        data[index] = entry
+        self._positions[entry[2]] = index
+
+    def __sift_down(self, index: int) -> None:
+        """
+        Moves the entry at the given index down the heap until neither of its
+        children are cheaper, updating the positions of every entry moved.
+        :param index: The index of the entry to move.
+        :return: None.
+        """
+        data: List[Tuple[int, int, PancakeStack]] = self._data
+        length: int = len(data)
+        entry: Tuple[int, int, PancakeStack] = data[index]
+        child_index: int = 2 * index + 1
+        while child_index < length:
+            right_index: int = child_index + 1
+            if right_index < length and data[right_index] < data[child_index]:
+                child_index = right_index
+            child: Tuple[int, int, PancakeStack] = data[child_index]
+            if not child < entry:
+                break
+            data[index] = child
+            self._positions[child[2]] = index
+            index = child_index
+            child_index = 2 * index + 1
+        data[index] = entry
+        self._positions[entry[2]] = index
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+
+
+class FlipCost(ABC):
+    """
+    The cost of flipping part of a stack of pancakes. Flips are described the
+    same way PancakeStack describes them: by the index of the lowest pancake
+    flipped, where the 0th index is the bottom of the stack, so a flip at a
+    given index moves length - index pancakes.
+    """
+
+    @abstractmethod
+    def cost(self, length: int, index: int) -> int:
+        """
+        Gets the cost of a flip.
+        :param length: The number of pancakes in the stack.
+        :param index: The index of the lowest pancake flipped.
+        :return: The cost of the flip.
+        """
+        raise NotImplementedError
+
+    def minimum(self, length: int) -> int:
+        """
+        Gets the cost of the cheapest flip of a stack. Heuristics count flips
+        and multiply by this cost, which keeps them admissible however the
+        cost of a flip varies.
+        :param length: The number of pancakes in the stack.
+        :return: The cost of the cheapest flip.
+        """
+        return min(self.cost(length, index) for index in range(length))
+
+    def is_uniform(self) -> bool:
+        """
+        Determines whether every flip of a stack costs the same, in which case
+        the cheapest solution is the one with the fewest flips.
+        :return: A boolean value -- true if every flip costs the same.
+        """
+        return False
+
+
+class FlatFlipCost(FlipCost):
+    """
+    Every flip costs the same fixed amount plus the number of pancakes in the
+    stack, however many pancakes it moves.
+    """
+
+    def __init__(self, fixed: int = 20):
+        """
+        Initializes the cost model.
+        :param fixed: The cost every flip has on top of the size of the stack.
+        """
+        self._fixed: int = fixed
+
+    def cost(self, length: int, index: int) -> int:
+        """
+        Gets the cost of a flip.
+        :param length: The number of pancakes in the stack.
+        :param index: The index of the lowest pancake flipped.
+        :return: The cost of the flip.
+        """
+        return self._fixed + length
+
+    def minimum(self, length: int) -> int:
+        """
+        Gets the cost of the cheapest flip of a stack.
+        :param length: The number of pancakes in the stack.
+        :return: The cost of the cheapest flip.
+        """
+        return self._fixed + length
+
+    def is_uniform(self) -> bool:
+        """
+        Determines whether every flip of a stack costs the same.
+        :return: True.
+        """
+        return True
+
+
+class LinearFlipCost(FlipCost):
+    """
+    A flip costs a fixed amount plus an amount for every pancake it moves, so
+    flipping the whole stack costs more than flipping the top two pancakes.
+    """
+
+    def __init__(self, fixed: int, per_pancake: int):
+        """
+        Initializes the cost model.
+        :param fixed: The cost every flip has.
+        :param per_pancake: The cost of every pancake moved by a flip.
+        """
+        self._fixed: int = fixed
+        self._per_pancake: int = per_pancake
+
+    def cost(self, length: int, index: int) -> int:
+        """
+        Gets the cost of a flip.
+        :param length: The number of pancakes in the stack.
+        :param index: The index of the lowest pancake flipped.
+        :return: The cost of the flip.
+        """
+        return self._fixed + self._per_pancake * (length - index)
+
+    def minimum(self, length: int) -> int:
+        """
+        Gets the cost of the cheapest flip of a stack, the one that moves only
+        the top pancake.
+        :param length: The number of pancakes in the stack.
+        :return: The cost of the cheapest flip.
+        """
+        return self._fixed + self._per_pancake
+
+    def is_uniform(self) -> bool:
+        """
+        Determines whether every flip of a stack costs the same.
+        :return: A boolean value -- true if moving pancakes is free.
+        """
+        return self._per_pancake == 0
+
+
+# The cost model used when no other cost model is asked for.
+DEFAULT_FLIP_COST: FlipCost = FlatFlipCost()
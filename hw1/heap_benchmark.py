@@ -0,0 +1,172 @@
+import heapq
+import random
+import sys
+import time
+from cake_heap import CakeHeap
+from lazy_cake_heap import LazyCakeHeap
+from bucket_queue import BucketQueue
+from pancake_stack import PancakeStack
+from best_first import best_first_search
+from typing import Callable, Dict, List, Tuple
+
+# Operations in a workload.
+PUSH: int = 0
+DECREASE: int = 1
+POP: int = 2
+# Seed for the random workloads, so every run benchmarks the same operations.
+SEED: int = 131
+# The number of times each workload is run. The fastest run is reported.
+REPEATS: int = 5
+
+
+def make_workload(operations: int, decrease_rate: float) -> \
+        List[Tuple[int, int, int]]:
+    """
+    Creates a random workload shaped like a best-first search: new items are
+    pushed with a cost at least that of the last item popped, some recently
+    pushed items get cheaper, and the cheapest item is popped.
+    :param operations: The number of operations in the workload.
+    :param decrease_rate: The fraction of operations that decrease the cost
+    of an item already in the heap.
+    :return: The operations, as tuples of (operation, item, cost).
+    """
+    generator: random.Random = random.Random(SEED)
+    workload: List[Tuple[int, int, int]] = []
+    # The items in the heap and their costs, plus a heap used to work out
+    # which item each pop takes off.
+    costs: Dict[int, int] = {}
+    reference: List[Tuple[int, int]] = []
+    floor: int = 0
+    pushed: int = 0
+    for _ in range(operations):  # type: int
+        roll: float = generator.random()
+        if roll < decrease_rate and pushed:
+            item: int = pushed - generator.randint(1, min(pushed, 64))
+            if costs.get(item, floor) > floor:
+                costs[item] = generator.randint(floor, costs[item] - 1)
+                heapq.heappush(reference, (costs[item], item))
+                workload.append((DECREASE, item, costs[item]))
+                continue
+        if roll < 0.6 or not costs:
+            costs[pushed] = floor + generator.randint(0, 50)
+            heapq.heappush(reference, (costs[pushed], pushed))
+            workload.append((PUSH, pushed, costs[pushed]))
+            pushed += 1
+        else:
+            while costs.get(reference[0][1]) != reference[0][0]:
+                heapq.heappop(reference)
+            floor, item = heapq.heappop(reference)
+            del costs[item]
+            workload.append((POP, item, floor))
+    return workload
+
+
+def run_indexed(workload: List[Tuple[int, int, int]]) -> Tuple[float, int]:
+    """
+    Runs a workload on a CakeHeap.
+    :param workload: The operations to run.
+    :return: The time taken in seconds, and the largest number of entries the
+    heap held.
+    """
+    heap: CakeHeap = CakeHeap()
+    peak: int = 0
+    start: float = time.perf_counter()
+    for operation, item, cost in workload:  # type: int, int, int
+        if operation == POP:
+            heap.pop()
+        else:
+            heap.push(item, cost)
+            if len(heap) > peak:
+                peak = len(heap)
+    return time.perf_counter() - start, peak
+
+
+def run_buckets(workload: List[Tuple[int, int, int]]) -> Tuple[float, int]:
+    """
+    Runs a workload on a BucketQueue.
+    :param workload: The operations to run.
+    :return: The time taken in seconds, and the largest number of entries the
+    queue held.
+    """
+    queue: BucketQueue = BucketQueue()
+    peak: int = 0
+    start: float = time.perf_counter()
+    for operation, item, cost in workload:  # type: int, int, int
+        if operation == POP:
+            queue.pop()
+        else:
+            queue.push(item, cost)
+            if len(queue) > peak:
+                peak = len(queue)
+    return time.perf_counter() - start, peak
+
+
+def run_lazy(workload: List[Tuple[int, int, int]]) -> Tuple[float, int]:
+    """
+    Runs a workload on a LazyCakeHeap.
+    :param workload: The operations to run.
+    :return: The time taken in seconds, and the largest number of entries the
+    heap held.
+    """
+    heap: LazyCakeHeap = LazyCakeHeap()
+    peak: int = 0
+    start: float = time.perf_counter()
+    for operation, item, cost in workload:  # type: int, int, int
+        if operation == POP:
+            heap.pop()
+        else:
+            if operation == DECREASE:
+                heap.remove(item)
+            heap.push(item, cost)
+            if heap.stored() > peak:
+                peak = heap.stored()
+    return time.perf_counter() - start, peak
+
+
+def run_search(frontier_type: Callable, sizes: List[int]) -> float:
+    """
+    Times uniform cost searches (which push and decrease far more than a*)
+    on seeded random stacks using the given frontier.
+    :param frontier_type: The class of the frontier to use.
+    :param sizes: The number of pancakes in each stack to solve.
+    :return: The time taken in seconds.
+    """
+    generator: random.Random = random.Random(SEED)
+    elapsed: float = 0.0
+    for size in sizes:  # type: int
+        data: List[int] = list(range(1, size + 1))
+        generator.shuffle(data)
+        initial_state: PancakeStack = PancakeStack(data, 0)
+        goal_state: PancakeStack = PancakeStack(range(size, 0, -1), -1)
+        start: float = time.perf_counter()
+        best_first_search(initial_state, goal_state.__eq__,
+                          PancakeStack.children, PancakeStack.step_cost,
+                          PancakeStack.heuristic_cost, h_weight=0,
+                          frontier_type=frontier_type)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+if __name__ == "__main__":
+    size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print('Random workloads of {} operations:'.format(size))
+    print('{:>10} {:>14} {:>10} {:>12}'.format(
+        'decreases', 'heap', 'seconds', 'peak size'))
+    for rate in (0.0, 0.1, 0.3):  # type: float
+        operations: List[Tuple[int, int, int]] = make_workload(size, rate)
+        for name, runner in (('CakeHeap', run_indexed),
+                             ('LazyCakeHeap', run_lazy),
+                             ('BucketQueue', run_buckets)):
+            results: List[Tuple[float, int]] = \
+                [runner(operations) for _ in range(REPEATS)]
+            print('{:>10.0%} {:>14} {:>10.3f} {:>12}'.format(
+                rate, name, min(seconds for seconds, _ in results),
+                results[0][1]))
+
+    print('\nUniform cost search on seeded random stacks:')
+    print('{:>14} {:>10}'.format('heap', 'seconds'))
+    for name, frontier in (('CakeHeap', CakeHeap),
+                           ('LazyCakeHeap', LazyCakeHeap),
+                           ('BucketQueue', BucketQueue)):
+        print('{:>14} {:>10.3f}'.format(
+            name, run_search(frontier, [7, 8, 8, 8])))
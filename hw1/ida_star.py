@@ -0,0 +1,113 @@
+from pancake_stack import PancakeStack
+from pancake_heuristics import PancakeHeuristic
+from search_stats import SearchStats
+from typing import Callable, Dict, Tuple, List, Optional, Union
+
+# Returned by the depth first search once the goal has been found.
+FOUND: int = -1
+# Bound used when there is nothing left to search.
+INFINITY: float = float('inf')
+
+
+def ida_star(initial_state: PancakeStack, goal_state: PancakeStack,
+             heuristic: Optional[PancakeHeuristic] = None,
+             stats: Optional[SearchStats] = None,
+             compact: bool = False) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
+    """
+    Given an initial state and a goal state finds a series of flips to get
+    from the initial state to the goal using iterative deepening a*. A series
+    of depth first searches is run, each one cut off at states whose estimated
+    cost to the goal (g + h) is over a bound that is raised to the smallest
+    cut off cost after every iteration. Only the current path is kept, as
+    the keys of the stacks on it and the flips between them, so memory is
+    linear in the length of the solution rather than in the number of states
+    seen. Works for every kind of stack (including BurntPancakeStack) and
+    flip cost model.
+    :param initial_state: The initial state to get to the goal from.
+    :param goal_state: The goal state to get to from the initial state.
+    :param heuristic: The heuristic to guide the search with. Defaults to the
+    heuristic the initial state was created with.
+    :param stats: Filled in with statistics about the search if given. The
+    peak frontier size is the longest path tried.
+    :param compact: If true the solution is returned as a list of flips (see
+    move_list) instead of a dictionary of states.
+    :return: A tuple containing: a dictionary where each key is a state, and
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
+    """
+    if heuristic is not None:
+        initial_state = initial_state.with_heuristic(heuristic)
+    heuristic = initial_state.heuristic()
+    flip_cost: int = initial_state.flip_cost()
+    flip_key: Callable[[bytes, int], bytes] = initial_state.flip_key
+    flips: range = initial_state.useful_flips()
+    flip_costs: List[int] = [initial_state.flip_cost(i) for i in flips]
+    goal: bytes = goal_state.get_key()
+    moves: List[int] = []
+
+    def search(stack: bytes, cost: int, heuristic_cost: int, bound: float,
+               last_flip: int) -> float:
+        """
+        Depth first search from the current stack, cut off at the bound.
+        :param stack: The key of the current stack.
+        :param cost: The cost of the flips made to get to the current stack.
+        :param heuristic_cost: The heuristic cost of the current stack.
+        :param bound: The largest estimated cost allowed.
+        :param last_flip: The flip made to get to the current stack.
+        :return: FOUND if the goal was found, otherwise the smallest estimated
+        cost over the bound.
+        """
+        estimate: int = cost + heuristic_cost
+        if estimate > bound:
+            return estimate
+        if stack == goal:
+            return FOUND
+        if stats is not None:
+            stats.expand(stack, len(moves) + 1)
+            stats.generated += len(flips) - 1 if last_flip >= 0 \
+                else len(flips)
+        minimum: float = INFINITY
+        # Redoing the last flip would just undo it.
+        for i in flips:  # type: int
+            if i == last_flip:
+                continue
+            child_heuristic_cost: int = \
+                heuristic.flipped(stack, heuristic_cost, i, flip_cost)
+            moves.append(i)
+            result: float = search(flip_key(stack, i), cost + flip_costs[i],
+                                   child_heuristic_cost, bound, i)
+            if result == FOUND:
+                return FOUND
+            moves.pop()
+            if result < minimum:
+                minimum = result
+        return minimum
+
+    if stats is not None:
+        stats.start()
+    bound: float = initial_state.heuristic_cost()
+    while True:
+        if stats is not None:
+            stats.iterations += 1
+        result: float = search(initial_state.get_key(), 0,
+                               initial_state.heuristic_cost(), bound, -1)
+        if result != FOUND and result != INFINITY:
+            bound = result
+            continue
+        if stats is not None:
+            stats.finish()
+        if result == INFINITY:
+            return None
+        break
+
+    if compact:
+        return moves
+    path: Dict[PancakeStack, PancakeStack] = {initial_state: None}
+    current: PancakeStack = initial_state
+    for move in moves:  # type: int
+        child: PancakeStack = current.flip(move)
+        path[child] = current
+        current = child
+    return path, current
@@ -1,37 +1,79 @@
+import argparse
+import sys
 from pancake_stack import PancakeStack
+from burnt_pancake_stack import BurntPancakeStack
+from burnt_pancake_heuristics import BURNT
+from flip_cost import FlipCost
+from pancake_heuristics import PancakeHeuristic, GapHeuristic, \
+    MisplacedHeuristic, MaxHeuristic
+from pattern_database import PatternDatabase
 from a_star import a_star
 from uniform_cost import uniform_cost
-from typing import Tuple, Optional, Dict, List
+from search_stats import SearchStats
+from move_list import replay
+from typing import Dict, Optional, List, Sequence, Tuple
 
 START_COST_TO_PARENT = 0
+# The heuristics for plain pancakes that can be picked from the command line
+# (see make_heuristic).
+HEURISTICS: List[str] = ['gap', 'misplaced', 'pdb', 'gap_pdb']
 
+# Heuristics already made by this process, by name and size.
+_made_heuristics: Dict[Tuple[str, int], PancakeHeuristic] = {}
 
-def print_path(
-        path_and_goal: Tuple[Dict[PancakeStack, PancakeStack], PancakeStack]) \
-        -> None:
+
+def print_moves(initial_state: PancakeStack,
+                moves: Optional[Sequence[int]]) -> None:
     """
-    Print the solution path.
-    :param path_and_goal: A tuple containing: a dictionary where each key is a
-    state, and each value is that state's parent, and the goal state. Can be
+    Print the solution path from a list of flips, from the initial state to
+    the goal. The states are rebuilt one at a time as they are printed.
+    :param initial_state: The state the solution starts from.
+    :param moves: The index of the lowest pancake flipped by each flip. Can be
     None if no path exists.
     :return: None
     """
-    if path_and_goal is None:
+    if moves is None:
         print("No solution")
         return
-    current: PancakeStack = path_and_goal[1]
-    path: Dict[PancakeStack, PancakeStack] = path_and_goal[0]
-    while True:
-        print(current)
-        if path.get(current) is None:
-            return
-        current = path[current]
+    for state in replay(initial_state, moves):  # type: PancakeStack
+        print(state)
 
 
-def convert_to_cake(user_input: str) -> Optional[PancakeStack]:
+def make_heuristic(name: str, size: int) -> PancakeHeuristic:
+    """
+    Makes one of the heuristics that can be picked from the command line, for
+    stacks of plain pancakes of the given size: 'gap', 'misplaced', 'pdb' (a
+    pattern database of the largest pancakes) or 'gap_pdb' (the larger of the
+    gap heuristic and the pattern database). Pattern databases are loaded
+    from their default directory, and built and saved there the first time
+    they are needed.
+    :param name: The name of the heuristic.
+    :param size: The number of pancakes in the stacks.
+    :return: The heuristic.
+    """
+    if (name, size) not in _made_heuristics:
+        if name == 'gap':
+            heuristic: PancakeHeuristic = GapHeuristic()
+        elif name == 'misplaced':
+            heuristic = MisplacedHeuristic()
+        elif name == 'pdb':
+            heuristic = PatternDatabase.load_or_build(size)
+        elif name == 'gap_pdb':
+            heuristic = MaxHeuristic(GapHeuristic(),
+                                     PatternDatabase.load_or_build(size))
+        else:
+            raise ValueError('Unknown heuristic: {}'.format(name))
+        _made_heuristics[name, size] = heuristic
+    return _made_heuristics[name, size]
+
+
+def convert_to_cake(user_input: str,
+                    cost_model: Optional[FlipCost] = None) -> \
+        Optional[PancakeStack]:
     """
     Converts user input into a PancakeStack if possible.
     :param user_input: The string to attempt to convert to a PancakeStack.
+    :param cost_model: The cost of flips, or None for the default.
     :return: The PancakeStack if successful, None otherwise.
     """
     integers: List[int] = [int(x) for x in user_input.split(',')]
@@ -39,7 +81,31 @@ def convert_to_cake(user_input: str) -> Optional[PancakeStack]:
     for index, item in enumerate(sorted_integers):  # type: int, int
         if item != (index+1):
             return None
-    return PancakeStack(integers, START_COST_TO_PARENT)
+    return PancakeStack(integers, START_COST_TO_PARENT,
+                        cost_model=cost_model)
+
+
+def convert_to_burnt_cake(user_input: str,
+                          cost_model: Optional[FlipCost] = None) -> \
+        Optional[BurntPancakeStack]:
+    """
+    Converts user input into a BurntPancakeStack if possible. Pancakes with
+    the burnt side facing up are entered as negative numbers. Stacks of more
+    than 127 pancakes can not be stored, so they are rejected.
+    :param user_input: The string to attempt to convert to a
+    BurntPancakeStack.
+    :param cost_model: The cost of flips, or None for the default.
+    :return: The BurntPancakeStack if successful, None otherwise.
+    """
+    integers: List[int] = [int(x) for x in user_input.split(',')]
+    sorted_integers: List[int] = sorted(abs(x) for x in integers)
+    for index, item in enumerate(sorted_integers):  # type: int, int
+        if item != (index+1):
+            return None
+    if len(integers) >= BURNT:
+        return None
+    return BurntPancakeStack(integers, START_COST_TO_PARENT,
+                             cost_model=cost_model)
 
 
 def greet_user() -> None:
@@ -69,6 +135,18 @@ def get_input() -> str:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Sorts a stack of pancakes with A* and uniform-cost '
+                    'search.')
+    parser.add_argument('-m', '--memory', action='store_true',
+                        help='Also report the peak memory of each search. '
+                             'This slows the searches down a lot.')
+    parser.add_argument('-H', '--heuristic', default='gap',
+                        choices=HEURISTICS,
+                        help='The heuristic A* uses (default: gap). pdb is '
+                             'a pattern database, built and saved the first '
+                             'time a stack of its size is solved.')
+    args: argparse.Namespace = parser.parse_args(sys.argv[1:])
     initial_cake: PancakeStack = None
 
     greet_user()
@@ -79,13 +157,21 @@ if __name__ == "__main__":
         except ValueError:
             pass
 
+    initial_cake = initial_cake.with_heuristic(
+        make_heuristic(args.heuristic, len(initial_cake)))
     goal_cake: PancakeStack = PancakeStack(
         sorted(initial_cake.get_data(), reverse=True), -1)
 
-    star_result = a_star(initial_cake, goal_cake)
-    uniform_result = uniform_cost(initial_cake, goal_cake)
+    star_stats: SearchStats = SearchStats(track_memory=args.memory)
+    star_result = a_star(initial_cake, goal_cake, stats=star_stats,
+                         compact=True)
+    uniform_stats: SearchStats = SearchStats(track_memory=args.memory)
+    uniform_result = uniform_cost(initial_cake, goal_cake,
+                                  stats=uniform_stats, compact=True)
 
     print("A* result:")
-    print_path(star_result)
+    print_moves(initial_cake, star_result)
+    print(star_stats)
     print("Uniform-cost result:")
-    print_path(uniform_result)
+    print_moves(initial_cake, uniform_result)
+    print(uniform_stats)
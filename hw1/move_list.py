@@ -0,0 +1,60 @@
+from pancake_stack import PancakeStack
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def moves_from_parents(parents: Dict[bytes, Optional[bytes]],
+                       last_key: bytes) -> List[int]:
+    """
+    Gets the flips on the path to a state from a dictionary of parent keys,
+    as recorded by the solvers in compact mode.
+    :param parents: A dictionary where each key is the key of a state, and
+    each value is the key of that state's parent (None for the initial state).
+    :param last_key: The key of the state at the end of the path.
+    :return: The index of the lowest pancake flipped by each flip, in order.
+    """
+    moves: List[int] = []
+    child_key: bytes = last_key
+    parent_key: Optional[bytes] = parents[child_key]
+    while parent_key is not None:
+        moves.append(PancakeStack.flip_between(parent_key, child_key))
+        child_key = parent_key
+        parent_key = parents[child_key]
+    moves.reverse()
+    return moves
+
+
+def moves_from_path(
+        path_and_goal: Tuple[Dict[PancakeStack, PancakeStack], PancakeStack]) \
+        -> List[int]:
+    """
+    Gets the flips that make up a solution returned in the full format.
+    :param path_and_goal: A tuple containing: a dictionary where each key is a
+    state, and each value is that state's parent, and the goal state.
+    :return: The index of the lowest pancake flipped by each flip, in order.
+    """
+    path: Dict[PancakeStack, PancakeStack] = path_and_goal[0]
+    current: PancakeStack = path_and_goal[1]
+    moves: List[int] = []
+    while path.get(current) is not None:
+        parent: PancakeStack = path[current]
+        moves.append(PancakeStack.flip_between(parent.get_key(),
+                                               current.get_key()))
+        current = parent
+    moves.reverse()
+    return moves
+
+
+def replay(initial_state: PancakeStack, moves: Sequence[int]) -> \
+        Iterator[PancakeStack]:
+    """
+    Lazily rebuilds the states on a solution from its flips. Only one state
+    is alive at a time unless the caller keeps them.
+    :param initial_state: The state the solution starts from.
+    :param moves: The index of the lowest pancake flipped by each flip.
+    :return: The initial state, then the state after each flip, in order.
+    """
+    current: PancakeStack = initial_state
+    yield current
+    for move in moves:  # type: int
+        current = current.flip(move)
+        yield current
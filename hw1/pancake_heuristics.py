@@ -0,0 +1,192 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+
+class PancakeHeuristic(ABC):
+    """
+    Estimates the cost of sorting a stack of pancakes. The stacks handed to a
+    heuristic follow the same layout as PancakeStack: the 0th index is the
+    bottom of the stack, and the goal is the stack sorted from the largest
+    pancake (at the bottom) to the smallest (at the top).
+    """
+
+    @abstractmethod
+    def estimate(self, data: Sequence[int], flip_cost: int) -> int:
+        """
+        Estimates the cost to get from the given stack to the goal.
+        :param data: The stack to estimate the cost for.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost.
+        """
+        raise NotImplementedError
+
+    def flipped(self,
+                data: Sequence[int],
+                estimate: int,
+                index: int,
+                flip_cost: int) -> int:
+        """
+        Estimates the cost to the goal of the stack produced by flipping the
+        given stack at the given index, reusing the given stack's estimate
+        where possible. By default the estimate is calculated from scratch.
+        :param data: The stack before the flip.
+        :param estimate: The estimate for the stack before the flip.
+        :param index: The index of the lowest pancake flipped.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost for the stack after the flip.
+        """
+        return self.estimate(data[:index] + data[index:][::-1], flip_cost)
+
+
+class MisplacedHeuristic(PancakeHeuristic):
+    """
+    Counts the pancakes that are not where they will be in the goal stack.
+    Every misplaced pancake needs at least one flip, and with the default cost
+    model one flip always costs more than the number of pancakes in the stack,
+    so the count is admissible (but weak). It is not admissible for cost
+    models where a flip can cost less than that.
+    """
+
+    def estimate(self, data: Sequence[int], flip_cost: int) -> int:
+        """
+        Estimates the cost to get from the given stack to the goal.
+        :param data: The stack to estimate the cost for.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost.
+        """
+        length: int = len(data)
+        cost: int = 0
+        for index, pancake in enumerate(data):  # type: int, int
+            if pancake != (length - index):
+                cost += 1
+        return cost
+
+    def flipped(self,
+                data: Sequence[int],
+                estimate: int,
+                index: int,
+                flip_cost: int) -> int:
+        """
+        Estimates the cost to the goal of the stack produced by flipping the
+        given stack at the given index. Only the flipped pancakes can change
+        from misplaced to placed (or back), so this takes O(n - index) time.
+        :param data: The stack before the flip.
+        :param estimate: The estimate for the stack before the flip.
+        :param index: The index of the lowest pancake flipped.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost for the stack after the flip.
+        """
+        length: int = len(data)
+        top: int = length - 1 + index
+        for position in range(index, length):  # type: int
+            goal: int = length - position
+            estimate += (data[top - position] != goal) - \
+                (data[position] != goal)
+        return estimate
+
+
+class GapHeuristic(PancakeHeuristic):
+    """
+    The gap heuristic. Two neighbouring pancakes form a gap if they are not
+    consecutive sizes, and the bottom pancake forms a gap with the plate if it
+    is not the largest pancake. A flip only changes one pair of neighbours
+    (the pancake it is inserted under and the one that ends up on top of it),
+    so it can remove at most one gap and the number of gaps is a lower bound
+    on the number of flips left.
+    """
+
+    def estimate(self, data: Sequence[int], flip_cost: int) -> int:
+        """
+        Estimates the cost to get from the given stack to the goal.
+        :param data: The stack to estimate the cost for.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost.
+        """
+        return GapHeuristic.gaps(data) * flip_cost
+
+    def flipped(self,
+                data: Sequence[int],
+                estimate: int,
+                index: int,
+                flip_cost: int) -> int:
+        """
+        Estimates the cost to the goal of the stack produced by flipping the
+        given stack at the given index in constant time. Only the pair made
+        of the pancake below the spatula and the pancake above it changes:
+        the top pancake ends up where the pancake at the index was.
+        :param data: The stack before the flip.
+        :param estimate: The estimate for the stack before the flip.
+        :param index: The index of the lowest pancake flipped.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost for the stack after the flip.
+        """
+        below: int = data[index - 1] if index else len(data) + 1
+        before: int = abs(below - data[index]) != 1
+        after: int = abs(below - data[-1]) != 1
+        return estimate + (after - before) * flip_cost
+
+    @staticmethod
+    def gaps(data: Sequence[int]) -> int:
+        """
+        Counts the gaps in the given stack.
+        :param data: The stack to count the gaps in.
+        :return: The number of gaps.
+        """
+        # The plate acts like a pancake one larger than the largest one.
+        below: int = len(data) + 1
+        gaps: int = 0
+        for pancake in data:  # type: int
+            if abs(below - pancake) != 1:
+                gaps += 1
+            below = pancake
+        return gaps
+
+
+class MaxHeuristic(PancakeHeuristic):
+    """
+    Combines several admissible heuristics by taking the largest estimate,
+    which is still admissible.
+    """
+
+    def __init__(self, *heuristics: PancakeHeuristic):
+        """
+        Initializes the combined heuristic.
+        :param heuristics: The heuristics to combine.
+        """
+        self._heuristics: Sequence[PancakeHeuristic] = heuristics
+
+    def estimate(self, data: Sequence[int], flip_cost: int) -> int:
+        """
+        Estimates the cost to get from the given stack to the goal.
+        :param data: The stack to estimate the cost for.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost.
+        """
+        return max(heuristic.estimate(data, flip_cost)
+                   for heuristic in self._heuristics)
+
+    def flipped(self,
+                data: Sequence[int],
+                estimate: int,
+                index: int,
+                flip_cost: int) -> int:
+        """
+        Estimates the cost to the goal of the stack produced by flipping the
+        given stack at the given index. The combined estimate does not say
+        what each heuristic estimated, so each one estimates the given stack
+        again and then the flip its own way (which, for burnt pancakes, also
+        turns the flipped pancakes over).
+        :param data: The stack before the flip.
+        :param estimate: The estimate for the stack before the flip.
+        :param index: The index of the lowest pancake flipped.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost for the stack after the flip.
+        """
+        return max(heuristic.flipped(data,
+                                     heuristic.estimate(data, flip_cost),
+                                     index, flip_cost)
+                   for heuristic in self._heuristics)
+
+
+# The heuristic used when no other heuristic is asked for.
+DEFAULT_HEURISTIC: PancakeHeuristic = GapHeuristic()
@@ -1,4 +1,7 @@
-from typing import Sequence, List, Tuple
+import permutation_rank
+from pancake_heuristics import PancakeHeuristic, DEFAULT_HEURISTIC
+from flip_cost import FlipCost, DEFAULT_FLIP_COST
+from typing import Sequence, List, Optional
 
 
 class PancakeStack:
@@ -6,20 +9,51 @@ class PancakeStack:
     A representation of a stack of pancakes where the 0th index of the internal
     representation (_data) is the bottom of the stack, and the (len(_data)-1)th
     index is the top of the stack.
+
+    Searches keep millions of these around, so the stack is stored as bytes
+    (one byte per pancake, which limits stacks to 255 pancakes) and the class
+    uses __slots__ instead of a per-instance attribute dict.
+
+    The cost of a flip comes from a FlipCost, by default 20 plus the number of
+    pancakes in the stack. Subclasses (see BurntPancakeStack) can change how
+    the stack is stored and flipped by overriding flip_key and the methods
+    that read the stack.
     """
 
-    def __init__(self, data: Sequence[int], cost_to_parent: int):
+    __slots__ = ('_data', '_cost_to_parent', '_heuristic', '_heuristic_cost',
+                 '_cost_model', '_last_flip_cost')
+
+    def __init__(self, data: Sequence[int], cost_to_parent: int,
+                 heuristic: Optional[PancakeHeuristic] = None,
+                 heuristic_cost: Optional[int] = None,
+                 cost_model: Optional[FlipCost] = None,
+                 last_flip_cost: Optional[int] = None):
         """
         Initializes the stack of pancakes.
         :param data: The list representation of the pancake stack. The 0th
         index must be the bottom of the stack, and the (len(_data)-1)th index
         must be the top of the stack.
         :param cost_to_parent: The cost associated with the parent.
-        """
-        self._data: Tuple = tuple(data)
-        self._length: int = len(data)
+        :param heuristic: The heuristic used to estimate the cost to the goal.
+        Children use the same heuristic. Defaults to the gap heuristic.
+        :param heuristic_cost: The heuristic cost of this state if it is
+        already known. Calculated from scratch if not given.
+        :param cost_model: The cost of flips. Children use the same cost
+        model. Defaults to 20 plus the number of pancakes per flip.
+        :param last_flip_cost: The cost of the flip from the parent to this
+        state. Defaults to the cost of flipping the whole stack.
+        """
+        self._data: bytes = bytes(data)
         self._cost_to_parent: int = cost_to_parent
-        self._heuristic_cost: int = self.__calculate_heuristic_cost()
+        self._heuristic: PancakeHeuristic = \
+            DEFAULT_HEURISTIC if heuristic is None else heuristic
+        self._cost_model: FlipCost = \
+            DEFAULT_FLIP_COST if cost_model is None else cost_model
+        self._last_flip_cost: int = \
+            self._cost_model.cost(len(self._data), 0) \
+            if last_flip_cost is None else last_flip_cost
+        self._heuristic_cost: int = self.__calculate_heuristic_cost() \
+            if heuristic_cost is None else heuristic_cost
 
     def cost_to_parent(self) -> int:
         """
@@ -35,7 +69,7 @@ class PancakeStack:
         from the current node to the goal.
         :return: The cost to the goal from the start.
         """
-        return self.cost_to_parent() + self.__actual_cost_between_states() + \
+        return self._cost_to_parent + self._last_flip_cost + \
             self._heuristic_cost
 
     def cost_to_self(self) -> int:
@@ -43,7 +77,7 @@ class PancakeStack:
         Gets the cost to this state from the start state.
         :return: The cost to get to this state from the start state.
         """
-        return self.cost_to_parent() + self.__actual_cost_between_states()
+        return self._cost_to_parent + self._last_flip_cost
 
     def children(self) -> List['PancakeStack']:
         """
@@ -53,26 +87,129 @@ class PancakeStack:
         """
         children: List[PancakeStack] = []
         for i in range(self.__len__()):  # type: int
-            children.append(PancakeStack(self._data[0:i] +
-                                         tuple(reversed(
-                                             self._data[i:self.__len__()])),
-                                         self._cost_to_parent +
-                                         self.__actual_cost_between_states()))
+            children.append(self.flip(i))
         return children
 
+    def flip(self, index: int) -> 'PancakeStack':
+        """
+        Gets the child produced by sliding the spatula under the pancake at
+        the given index and flipping every pancake above it.
+        :param index: The index of the lowest pancake to flip.
+        :return: The child produced by the flip.
+        """
+        length: int = len(self._data)
+        return self.__class__(self.flip_key(self._data, index),
+                              self._cost_to_parent + self._last_flip_cost,
+                              self._heuristic,
+                              self._heuristic.flipped(
+                                  self._data,
+                                  self._heuristic_cost,
+                                  index,
+                                  self._cost_model.minimum(length)),
+                              self._cost_model,
+                              self._cost_model.cost(length, index))
+
+    @staticmethod
+    def flip_key(key: bytes, index: int) -> bytes:
+        """
+        Gets the key of the stack produced by a flip.
+        :param key: The key of the stack before the flip.
+        :param index: The index of the lowest pancake to flip.
+        :return: The key of the stack after the flip.
+        """
+        return key[:index] + key[index:][::-1]
+
+    def useful_flips(self) -> range:
+        """
+        Gets the flips that can change the stack. Flipping the top pancake on
+        its own does nothing.
+        :return: The indices of the useful flips.
+        """
+        return range(len(self._data) - 1)
+
+    @staticmethod
+    def flip_between(parent_key: bytes, child_key: bytes) -> int:
+        """
+        Gets the index of the flip that turns one stack into another.
+        :param parent_key: The key of the stack before the flip.
+        :param child_key: The key of the stack after the flip.
+        :return: The index of the lowest pancake flipped.
+        """
+        for index, pancake in enumerate(parent_key):  # type: int, int
+            if pancake != child_key[index]:
+                return index
+        return len(parent_key) - 1
+
+    def with_heuristic(self, heuristic: PancakeHeuristic) -> 'PancakeStack':
+        """
+        Gets a copy of this state that uses the given heuristic.
+        :param heuristic: The heuristic the copy (and its children) will use.
+        :return: The copy of this state.
+        """
+        return self.__class__(self._data, self._cost_to_parent, heuristic,
+                              None, self._cost_model, self._last_flip_cost)
+
+    def step_cost(self, child: 'PancakeStack') -> int:
+        """
+        Gets the cost of the flip that turns this state into the given child.
+        :param child: One of this state's children.
+        :return: The cost of the flip.
+        """
+        return child.cost_to_self() - self.cost_to_self()
+
+    def flip_cost(self, index: Optional[int] = None) -> int:
+        """
+        Gets the cost of a flip of this stack.
+        :param index: The index of the lowest pancake flipped, or None for the
+        cheapest flip.
+        :return: The cost of the flip.
+        """
+        if index is None:
+            return self._cost_model.minimum(len(self._data))
+        return self._cost_model.cost(len(self._data), index)
+
+    def cost_model(self) -> FlipCost:
+        """
+        Gets the cost model of flips.
+        :return: The cost model of flips.
+        """
+        return self._cost_model
+
+    def heuristic(self) -> PancakeHeuristic:
+        """
+        Gets the heuristic used to estimate the cost to the goal.
+        :return: The heuristic used to estimate the cost to the goal.
+        """
+        return self._heuristic
+
+    def heuristic_cost(self) -> int:
+        """
+        Gets the estimated cost to get to the goal from this state.
+        :return: The estimated cost.
+        """
+        return self._heuristic_cost
+
     def get_data(self) -> tuple:
         """
         Gets the underlying data of the PancakeStack.
         :return: The underlying data of the PancakeStack.
         """
+        return tuple(self._data)
+
+    def get_key(self) -> bytes:
+        """
+        Gets the compact key identifying this stack, one byte per pancake.
+        :return: The key identifying this stack.
+        """
         return self._data
 
-    def __actual_cost_between_states(self) -> int:
+    def rank(self) -> int:
         """
-        Gets the actual cost to move from one state to another.
-        :return: The actual cost to move from one state to another.
+        Gets the rank of this stack among all of the stacks with the same
+        number of pancakes, a single integer in 0..n!-1.
+        :return: The rank of this stack.
         """
-        return 20 + self.__len__()
+        return permutation_rank.rank([pancake - 1 for pancake in self._data])
 
     def __calculate_heuristic_cost(self) -> int:
         """
@@ -80,13 +217,10 @@ class PancakeStack:
         estimated cost to get to the goal from this state.)
         :return: The estimated cost.
         """
-        cost: int = 0
-        for index, pancake in enumerate(self._data):  # type: int, PancakeStack
-            if pancake != (index + 1):
-                cost += 1
-        return cost
+        return self._heuristic.estimate(
+            self._data, self._cost_model.minimum(len(self._data)))
 
-    def __key(self) -> Sequence[int]:
+    def __key(self) -> bytes:
         """
         Helper function that returns a key to be used in all equality and hash
         related functions.
@@ -100,7 +234,7 @@ class PancakeStack:
         stack.
         :return: The length of the PancakeStack.
         """
-        return self._length
+        return len(self._data)
 
     def __getitem__(self, index: int) -> int:
         """
@@ -123,16 +257,17 @@ class PancakeStack:
         Produces a string output of the PancakeStack.
         :return: The string output of the PancakeStack.
         """
-        return 'PancakeStack(Stack: {}. Cost to Stack: {})'\
-            .format(self._data, self.cost_to_self())
+        return '{}(Stack: {}. Cost to Stack: {})'\
+            .format(self.__class__.__name__, self.get_data(),
+                    self.cost_to_self())
 
     def __repr__(self) -> str:
         """
         Gets a string representation of the PancakeStack.
         :return: A string representation of the PancakeStack.
         """
-        return 'PancakeStack({}, {})'.format(self._data,
-                                             self._cost_to_parent)
+        return '{}({}, {})'.format(self.__class__.__name__, self.get_data(),
+                                   self._cost_to_parent)
 
     def __eq__(self, other: 'PancakeStack') -> bool:
         """
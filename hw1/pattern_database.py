@@ -0,0 +1,150 @@
+import os
+import pickle
+from collections import deque
+from pancake_heuristics import PancakeHeuristic
+from typing import Deque, Dict, FrozenSet, Optional, Sequence
+
+# Where pattern databases are saved to and loaded from by default.
+DEFAULT_DIRECTORY: str = os.path.join(os.path.dirname(__file__),
+                                      'pattern_databases')
+# The number of pancakes tracked by default.
+DEFAULT_TRACKED: int = 4
+# Stands in for every pancake that is not tracked.
+UNTRACKED: int = 0
+
+
+class PatternDatabase(PancakeHeuristic):
+    """
+    A pattern database heuristic. The stack is abstracted by keeping only the
+    tracked pancakes and replacing all the others by the same "don't care"
+    pancake. The exact number of flips needed to sort every abstract stack is
+    computed once with a breadth first search from the abstract goal, so a
+    lookup of the abstract stack gives an admissible estimate of the real
+    number of flips left.
+
+    The database only depends on the size of the stack and on which pancakes
+    are tracked, so it is built once and saved to disk.
+    """
+
+    def __init__(self,
+                 size: int,
+                 tracked: FrozenSet[int],
+                 distances: Dict[bytes, int]):
+        """
+        Initializes the pattern database. Use build or load to create one.
+        :param size: The number of pancakes in the stacks this database is for.
+        :param tracked: The pancakes tracked by the abstraction.
+        :param distances: The number of flips needed to sort each abstract
+        stack.
+        """
+        self._size: int = size
+        self._tracked: FrozenSet[int] = tracked
+        self._distances: Dict[bytes, int] = distances
+        self._table: bytes = PatternDatabase.__translation_table(tracked)
+
+    @staticmethod
+    def build(size: int, tracked: Sequence[int]) -> 'PatternDatabase':
+        """
+        Builds a pattern database.
+        :param size: The number of pancakes in the stacks the database is for.
+        :param tracked: The pancakes tracked by the abstraction.
+        :return: The new pattern database.
+        """
+        tracked_set: FrozenSet[int] = frozenset(tracked)
+        table: bytes = PatternDatabase.__translation_table(tracked_set)
+        goal: bytes = bytes(range(size, 0, -1)).translate(table)
+
+        # Flips are their own inverse, so searching outwards from the goal
+        # gives the distance from every abstract stack to the goal.
+        distances: Dict[bytes, int] = {goal: 0}
+        queue: Deque[bytes] = deque([goal])
+        while queue:
+            current: bytes = queue.popleft()
+            distance: int = distances[current] + 1
+            for i in range(size - 1):  # type: int
+                child: bytes = current[:i] + current[i:][::-1]
+                if child not in distances:
+                    distances[child] = distance
+                    queue.append(child)
+        return PatternDatabase(size, tracked_set, distances)
+
+    @staticmethod
+    def load(path: str) -> 'PatternDatabase':
+        """
+        Loads a pattern database that was saved to disk.
+        :param path: The file the pattern database was saved to.
+        :return: The pattern database.
+        """
+        with open(path, 'rb') as file:
+            size, tracked, distances = pickle.load(file)
+        return PatternDatabase(size, tracked, distances)
+
+    @staticmethod
+    def load_or_build(size: int,
+                      tracked: Optional[Sequence[int]] = None,
+                      directory: str = DEFAULT_DIRECTORY) \
+            -> 'PatternDatabase':
+        """
+        Loads a pattern database from the given directory, building and
+        saving it first if it does not exist yet.
+        :param size: The number of pancakes in the stacks the database is for.
+        :param tracked: The pancakes tracked by the abstraction. Defaults to
+        the largest pancakes.
+        :param directory: The directory pattern databases are kept in.
+        :return: The pattern database.
+        """
+        if tracked is None:
+            tracked = range(size, max(size - DEFAULT_TRACKED, 0), -1)
+        tracked = sorted(tracked)
+        path: str = os.path.join(directory, 'pdb_{}_{}.pickle'.format(
+            size, '-'.join(str(pancake) for pancake in tracked)))
+        if os.path.exists(path):
+            return PatternDatabase.load(path)
+        database: PatternDatabase = PatternDatabase.build(size, tracked)
+        os.makedirs(directory, exist_ok=True)
+        # Several processes (the workers of a batch, say) can build the same
+        # database at once, so it is saved under a name of its own and then
+        # moved into place, and the others never load half a file.
+        partial: str = '{}.{}'.format(path, os.getpid())
+        database.save(partial)
+        os.replace(partial, path)
+        return database
+
+    def save(self, path: str) -> None:
+        """
+        Saves the pattern database to disk.
+        :param path: The file to save the pattern database to.
+        :return: None.
+        """
+        with open(path, 'wb') as file:
+            pickle.dump((self._size, self._tracked, self._distances), file,
+                        pickle.HIGHEST_PROTOCOL)
+
+    def estimate(self, data: Sequence[int], flip_cost: int) -> int:
+        """
+        Estimates the cost to get from the given stack to the goal.
+        :param data: The stack to estimate the cost for.
+        :param flip_cost: The cost of the cheapest flip.
+        :return: The estimated cost.
+        """
+        if len(data) != self._size:
+            raise ValueError('Pattern database is for stacks of {} pancakes, '
+                             'got {}.'.format(self._size, len(data)))
+        return self._distances[bytes(data).translate(self._table)] * flip_cost
+
+    def __len__(self) -> int:
+        """
+        Gets the number of abstract stacks in the pattern database.
+        :return: The number of abstract stacks.
+        """
+        return len(self._distances)
+
+    @staticmethod
+    def __translation_table(tracked: FrozenSet[int]) -> bytes:
+        """
+        Creates the table used with bytes.translate to abstract a stack.
+        :param tracked: The pancakes tracked by the abstraction.
+        :return: The translation table.
+        """
+        return bytes(value if value in tracked else UNTRACKED
+                     for value in range(256))
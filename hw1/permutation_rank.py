@@ -0,0 +1,41 @@
+from typing import List, Sequence
+
+
+def rank(permutation: Sequence[int]) -> int:
+    """
+    Ranks a permutation of 0..n-1 into a single integer in 0..n!-1 in linear
+    time using the Myrvold-Ruskey ranking. The ranks are not lexicographic, but
+    every permutation of a given length gets a different rank, so the rank can
+    be used as a compact key or as an index into a table.
+    :param permutation: The permutation of 0..n-1 to rank.
+    :return: The rank of the permutation.
+    """
+    values: List[int] = list(permutation)
+    positions: List[int] = [0] * len(values)
+    for index, value in enumerate(values):  # type: int, int
+        positions[value] = index
+
+    result: int = 0
+    multiplier: int = 1
+    for size in range(len(values), 1, -1):  # type: int
+        last: int = values[size - 1]
+        position: int = positions[size - 1]
+        values[size - 1], values[position] = size - 1, last
+        positions[last], positions[size - 1] = position, size - 1
+        result += last * multiplier
+        multiplier *= size
+    return result
+
+
+def unrank(permutation_rank: int, size: int) -> List[int]:
+    """
+    Turns a rank produced by rank back into its permutation.
+    :param permutation_rank: The rank of the permutation.
+    :param size: The length of the permutation.
+    :return: The permutation of 0..size-1 with the given rank.
+    """
+    values: List[int] = list(range(size))
+    for length in range(size, 1, -1):  # type: int
+        permutation_rank, index = divmod(permutation_rank, length)
+        values[length - 1], values[index] = values[index], values[length - 1]
+    return values
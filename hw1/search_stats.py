@@ -0,0 +1,127 @@
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+
+class SearchStats:
+    """
+    Collects statistics about a single search. Every solver takes an optional
+    SearchStats and fills it in while it runs, so the same searches can be
+    compared across heuristics and frontier types:
+
+    expanded: The number of states taken off the frontier and expanded.
+    generated: The number of children created while expanding states.
+    decreased_keys: The number of times a cheaper path was found to a state
+    already on the frontier, so it had to be re-queued with a lower cost.
+    States that have been expanded are never re-queued.
+    peak_frontier: The largest the frontier got.
+    iterations: The number of depth first searches run (IDA* only).
+    peak_memory: The most memory (in bytes) allocated during the search, if
+    memory tracking was asked for. Tracking memory slows the search down a
+    lot, so leave it off when only timing.
+    timings: Seconds spent in each phase of the search, and in total.
+    """
+
+    def __init__(self,
+                 track_memory: bool = False,
+                 on_expand: Optional[Callable[[Any], None]] = None):
+        """
+        Initializes the statistics.
+        :param track_memory: Whether or not to track the peak memory used.
+        :param on_expand: Called with every state that is expanded, for
+        tracing a search.
+        """
+        self.expanded: int = 0
+        self.generated: int = 0
+        self.decreased_keys: int = 0
+        self.peak_frontier: int = 0
+        self.iterations: int = 0
+        self.peak_memory: Optional[int] = None
+        self.timings: Dict[str, float] = {}
+        self._track_memory: bool = track_memory
+        self._on_expand: Optional[Callable[[Any], None]] = on_expand
+        self._started: float = 0.0
+        self._started_tracing: bool = False
+
+    def start(self) -> None:
+        """
+        Marks the start of the search.
+        :return: None.
+        """
+        # If the caller is already tracing memory the peak also covers what
+        # they allocated before the search.
+        if self._track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._started = time.perf_counter()
+
+    def finish(self) -> None:
+        """
+        Marks the end of the search.
+        :return: None.
+        """
+        self.timings['total'] = time.perf_counter() - self._started
+        if self._track_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def expand(self, state: Any, frontier_size: int) -> None:
+        """
+        Records that a state was expanded.
+        :param state: The state expanded.
+        :param frontier_size: The size of the frontier before the state was
+        taken off it.
+        :return: None.
+        """
+        self.expanded += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if self._on_expand is not None:
+            self._on_expand(state)
+
+    def add_time(self, phase: str, started: float) -> None:
+        """
+        Adds the time since the given moment to a phase of the search.
+        :param phase: The name of the phase.
+        :param started: When the phase started, from time.perf_counter.
+        :return: None.
+        """
+        self.timings[phase] = self.timings.get(phase, 0.0) + \
+            time.perf_counter() - started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Gets the statistics as a dictionary, for writing out as JSON or CSV.
+        :return: The statistics.
+        """
+        stats: Dict[str, Any] = {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'decreased_keys': self.decreased_keys,
+            'peak_frontier': self.peak_frontier,
+            'iterations': self.iterations,
+            'peak_memory': self.peak_memory,
+        }
+        for phase, seconds in self.timings.items():  # type: str, float
+            stats['seconds_' + phase] = seconds
+        return stats
+
+    def __str__(self) -> str:
+        """
+        Produces a string output of the statistics.
+        :return: The string output of the statistics.
+        """
+        lines = ['Expanded: {}'.format(self.expanded),
+                 'Generated: {}'.format(self.generated),
+                 'Decreased keys: {}'.format(self.decreased_keys),
+                 'Peak frontier size: {}'.format(self.peak_frontier)]
+        if self.iterations:
+            lines.append('Iterations: {}'.format(self.iterations))
+        if self.peak_memory is not None:
+            lines.append('Peak memory: {:.1f} KiB'.format(
+                self.peak_memory / 1024))
+        for phase, seconds in self.timings.items():  # type: str, float
+            lines.append('Time ({}): {:.4f}s'.format(phase, seconds))
+        return '\n'.join(lines)
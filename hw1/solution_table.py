@@ -0,0 +1,241 @@
+import math
+import mmap
+import os
+import sys
+import permutation_rank
+from pancake_stack import PancakeStack
+from typing import Callable, Dict, Tuple, List, Optional, Union
+
+# Where solution tables are saved to and loaded from by default.
+DEFAULT_DIRECTORY: str = os.path.join(os.path.dirname(__file__),
+                                      'solution_tables')
+# The largest stack a table can be built for. Larger ones have too many
+# permutations to store.
+MAX_SIZE: int = 10
+# Written at the start of every table file.
+MAGIC: bytes = b'PANCAKE'
+# Marks an entry of the table that has not been filled in yet.
+UNSEEN: int = 0xFF
+# The number of bytes used by each entry: the distance and the next flip.
+ENTRY_SIZE: int = 2
+
+
+class SolutionTable:
+    """
+    A table holding, for every stack of a given size, the number of flips
+    needed to sort it and the first of those flips. Entries are indexed by the
+    rank of the stack (see permutation_rank), so looking up a stack and
+    following its flips to the goal takes O(n) time per flip, without any
+    search.
+
+    Tables are built once with a breadth first search from the sorted stack
+    and saved to disk. Loaded tables are memory-mapped, so they are only paged
+    in as needed and are shared between processes.
+    """
+
+    def __init__(self, size: int, entries):
+        """
+        Initializes the table. Use build or load to create one.
+        :param size: The number of pancakes in the stacks this table is for.
+        :param entries: The entries of the table, ENTRY_SIZE bytes per rank.
+        Anything indexable by integers, such as a bytearray or an mmap.
+        """
+        self._size: int = size
+        self._entries = entries
+        self._offset: int = len(MAGIC) + 1 if isinstance(entries, mmap.mmap) \
+            else 0
+
+    @staticmethod
+    def build(size: int) -> 'SolutionTable':
+        """
+        Builds the table for stacks of the given size. Stacks of 10 pancakes
+        have 3,628,800 permutations, so building that table takes a while.
+        :param size: The number of pancakes in the stacks. At most MAX_SIZE.
+        :return: The new table.
+        """
+        if not 0 < size <= MAX_SIZE:
+            raise ValueError('Solution tables can only be built for 1 to {} '
+                             'pancakes, not {}.'.format(MAX_SIZE, size))
+        count: int = 1
+        for length in range(2, size + 1):  # type: int
+            count *= length
+        entries: bytearray = bytearray([UNSEEN]) * (count * ENTRY_SIZE)
+
+        # Flips are their own inverse, so the flip that reaches a stack from
+        # its parent in a breadth first search from the goal is the first
+        # flip on a shortest path from that stack back to the goal.
+        goal_rank: int = permutation_rank.rank(range(size - 1, -1, -1))
+        entries[goal_rank * ENTRY_SIZE] = 0
+        layer: List[int] = [goal_rank]
+        distance: int = 0
+        while layer:
+            distance += 1
+            next_layer: List[int] = []
+            for current in layer:  # type: int
+                stack: List[int] = permutation_rank.unrank(current, size)
+                for i in range(size - 1):  # type: int
+                    child_rank: int = permutation_rank.rank(
+                        stack[:i] + stack[i:][::-1])
+                    if entries[child_rank * ENTRY_SIZE] == UNSEEN:
+                        entries[child_rank * ENTRY_SIZE] = distance
+                        entries[child_rank * ENTRY_SIZE + 1] = i
+                        next_layer.append(child_rank)
+            layer = next_layer
+        return SolutionTable(size, entries)
+
+    @staticmethod
+    def path(size: int, directory: str = DEFAULT_DIRECTORY) -> str:
+        """
+        Gets the file the table for the given size is saved in.
+        :param size: The number of pancakes in the stacks.
+        :param directory: The directory solution tables are kept in.
+        :return: The path of the table's file.
+        """
+        return os.path.join(directory, 'table_{}.bin'.format(size))
+
+    @staticmethod
+    def load(path: str) -> 'SolutionTable':
+        """
+        Memory-maps a table that was saved to disk. The file must hold an
+        entry for every stack of its size, so a truncated or stale file is
+        refused here rather than giving wrong flips when it is looked up.
+        :param path: The file the table was saved to.
+        :return: The table.
+        """
+        with open(path, 'rb') as file:
+            entries: mmap.mmap = mmap.mmap(file.fileno(), 0,
+                                           access=mmap.ACCESS_READ)
+        if len(entries) <= len(MAGIC) or entries[:len(MAGIC)] != MAGIC:
+            entries.close()
+            raise ValueError('{} is not a solution table.'.format(path))
+        size: int = entries[len(MAGIC)]
+        expected: int = len(MAGIC) + 1 + math.factorial(size) * ENTRY_SIZE
+        length: int = len(entries)
+        if length != expected:
+            entries.close()
+            raise ValueError('{} should be {} bytes for stacks of {} '
+                             'pancakes, but is {}. Build it again.'
+                             .format(path, expected, size, length))
+        return SolutionTable(size, entries)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the table to disk.
+        :param path: The file to save the table to.
+        :return: None.
+        """
+        with open(path, 'wb') as file:
+            file.write(MAGIC)
+            file.write(bytes([self._size]))
+            file.write(self._entries[self._offset:])
+
+    def size(self) -> int:
+        """
+        Gets the number of pancakes in the stacks this table is for.
+        :return: The number of pancakes.
+        """
+        return self._size
+
+    def distance(self, state: PancakeStack) -> int:
+        """
+        Gets the number of flips needed to sort the given stack.
+        :param state: The stack to look up.
+        :return: The number of flips needed.
+        """
+        return self._entries[self._offset + state.rank() * ENTRY_SIZE]
+
+    def flips(self, state: PancakeStack) -> List[int]:
+        """
+        Gets the flips that sort the given stack, fewest first.
+        :param state: The stack to look up.
+        :return: The index of the lowest pancake flipped by each flip, in
+        order.
+        """
+        flips: List[int] = []
+        stack: List[int] = [pancake - 1 for pancake in state.get_key()]
+        index: int = self._offset + permutation_rank.rank(stack) * ENTRY_SIZE
+        while self._entries[index] != 0:
+            flip: int = self._entries[index + 1]
+            flips.append(flip)
+            stack[flip:] = stack[flip:][::-1]
+            index = self._offset + permutation_rank.rank(stack) * ENTRY_SIZE
+        return flips
+
+    def solve(self, initial_state: PancakeStack) -> \
+            Tuple[Dict[PancakeStack, PancakeStack], PancakeStack]:
+        """
+        Sorts the given stack using the table.
+        :param initial_state: The stack to sort.
+        :return: A tuple containing: a dictionary where each key is a state,
+        and each value is that state's parent, and the goal state.
+        """
+        if len(initial_state) != self._size:
+            raise ValueError('Solution table is for stacks of {} pancakes, '
+                             'got {}.'.format(self._size, len(initial_state)))
+        path: Dict[PancakeStack, PancakeStack] = {initial_state: None}
+        current: PancakeStack = initial_state
+        for flip in self.flips(initial_state):  # type: int
+            child: PancakeStack = current.flip(flip)
+            path[child] = current
+            current = child
+        return path, current
+
+
+# Tables already loaded by this process, by directory and size (None if
+# there is no table of that size in that directory).
+_loaded_tables: Dict[Tuple[str, int], Optional[SolutionTable]] = {}
+
+
+def solve_with_table(
+        initial_state: PancakeStack,
+        goal_state: PancakeStack,
+        solver: Callable[..., Optional[Union[
+            Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+            List[int]]]],
+        directory: str = DEFAULT_DIRECTORY,
+        compact: bool = False) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
+    """
+    Solves a stack with a solution table if one has been built for its size,
+    otherwise with the given solver. Tables are only used for plain stacks
+    where every flip costs the same.
+    :param initial_state: The initial state to get to the goal from.
+    :param goal_state: The goal state to get to from the initial state.
+    :param solver: The search to fall back on, for example a_star.
+    :param directory: The directory solution tables are kept in.
+    :param compact: If true the solution is returned as a list of flips (see
+    move_list) instead of a dictionary of states. The solver must accept the
+    same compact argument.
+    :return: A tuple containing: a dictionary where each key is a state, and
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
+    """
+    size: int = len(initial_state)
+    if (directory, size) not in _loaded_tables:
+        path: str = SolutionTable.path(size, directory)
+        _loaded_tables[directory, size] = SolutionTable.load(path) \
+            if size <= MAX_SIZE and os.path.exists(path) else None
+    table: Optional[SolutionTable] = _loaded_tables[directory, size]
+    # Tables only know how to get to the sorted stack with the fewest flips.
+    if table is None or goal_state.get_key() != bytes(range(size, 0, -1)) \
+            or initial_state.__class__ is not PancakeStack \
+            or not initial_state.cost_model().is_uniform():
+        if compact:
+            return solver(initial_state, goal_state, compact=True)
+        return solver(initial_state, goal_state)
+    return table.flips(initial_state) if compact \
+        else table.solve(initial_state)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('Usage: python solution_table.py SIZE [SIZE ...]\n'
+              'Builds the solution tables for the given stack sizes (at most '
+              '{}) in {}.'.format(MAX_SIZE, DEFAULT_DIRECTORY))
+        sys.exit(1)
+    os.makedirs(DEFAULT_DIRECTORY, exist_ok=True)
+    for argument in sys.argv[1:]:  # type: str
+        table_size: int = int(argument)
+        SolutionTable.build(table_size).save(SolutionTable.path(table_size))
+        print('Built the solution table for {} pancakes.'.format(table_size))
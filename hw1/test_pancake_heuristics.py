@@ -0,0 +1,105 @@
+import random
+import unittest
+from pancake_stack import PancakeStack
+from burnt_pancake_stack import BurntPancakeStack
+from pancake_heuristics import PancakeHeuristic, MisplacedHeuristic, \
+    GapHeuristic, MaxHeuristic
+from burnt_pancake_heuristics import BurntGapHeuristic
+from pattern_database import PatternDatabase
+from flip_cost import FlipCost, FlatFlipCost, LinearFlipCost
+from typing import List, Sequence
+
+# The number of random stacks checked per heuristic and cost model.
+STACKS: int = 20
+# The number of random flips followed down from each stack.
+DEPTH: int = 6
+# The number of pancakes in each stack.
+SIZE: int = 7
+
+
+class TestFlipped(unittest.TestCase):
+    """
+    Checks that the estimate every heuristic gives a child incrementally
+    (through flipped) is the same as estimating the child from scratch.
+    """
+
+    def check(self, stacks: Sequence[PancakeStack]) -> None:
+        """
+        Checks every child of the given stacks, and of random descendants of
+        them.
+        :param stacks: The stacks to start from.
+        :return: None.
+        """
+        generator: random.Random = random.Random(0)
+        for stack in stacks:  # type: PancakeStack
+            for _ in range(DEPTH):
+                children: List[PancakeStack] = \
+                    [stack.flip(index) for index in stack.useful_flips()]
+                for child in children:  # type: PancakeStack
+                    self.assertEqual(
+                        child.heuristic_cost(),
+                        child.heuristic().estimate(
+                            child.get_key(),
+                            child.cost_model().minimum(len(child))),
+                        '{!r} {!r}'.format(stack, child))
+                stack = generator.choice(children)
+
+    def plain_stacks(self, heuristic: PancakeHeuristic,
+                     cost_model: FlipCost) -> List[PancakeStack]:
+        """
+        Gets seeded random stacks of pancakes.
+        :param heuristic: The heuristic of the stacks.
+        :param cost_model: The cost model of the stacks.
+        :return: The stacks.
+        """
+        generator: random.Random = random.Random(SIZE)
+        return [PancakeStack(generator.sample(range(1, SIZE + 1), SIZE), 0,
+                             heuristic, cost_model=cost_model)
+                for _ in range(STACKS)]
+
+    def burnt_stacks(self, heuristic: PancakeHeuristic,
+                     cost_model: FlipCost) -> List[PancakeStack]:
+        """
+        Gets seeded random stacks of burnt pancakes.
+        :param heuristic: The heuristic of the stacks.
+        :param cost_model: The cost model of the stacks.
+        :return: The stacks.
+        """
+        generator: random.Random = random.Random(SIZE)
+        return [BurntPancakeStack(
+                    [pancake * generator.choice((-1, 1)) for pancake in
+                     generator.sample(range(1, SIZE + 1), SIZE)],
+                    0, heuristic, cost_model=cost_model)
+                for _ in range(STACKS)]
+
+    def test_plain(self) -> None:
+        """
+        Checks the heuristics for plain pancakes.
+        :return: None.
+        """
+        database: PatternDatabase = PatternDatabase.build(SIZE, [1, 2, 3, 4])
+        heuristics: List[PancakeHeuristic] = [
+            MisplacedHeuristic(), GapHeuristic(), database,
+            MaxHeuristic(MisplacedHeuristic(), GapHeuristic(), database)]
+        for heuristic in heuristics:  # type: PancakeHeuristic
+            for cost_model in (FlatFlipCost(), LinearFlipCost(20, 1)):
+                with self.subTest(heuristic=type(heuristic).__name__,
+                                  cost_model=type(cost_model).__name__):
+                    self.check(self.plain_stacks(heuristic, cost_model))
+
+    def test_burnt(self) -> None:
+        """
+        Checks the heuristics for burnt pancakes.
+        :return: None.
+        """
+        heuristics: List[PancakeHeuristic] = [
+            BurntGapHeuristic(), MaxHeuristic(BurntGapHeuristic())]
+        for heuristic in heuristics:  # type: PancakeHeuristic
+            for cost_model in (FlatFlipCost(), LinearFlipCost(20, 1)):
+                with self.subTest(heuristic=type(heuristic).__name__,
+                                  cost_model=type(cost_model).__name__):
+                    self.check(self.burnt_stacks(heuristic, cost_model))
+
+
+if __name__ == '__main__':
+    unittest.main()
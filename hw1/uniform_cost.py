@@ -1,37 +1,41 @@
 from pancake_stack import PancakeStack
 from cake_heap import CakeHeap
-from typing import Dict, Tuple, List, Optional
+from search_stats import SearchStats
+from best_first import best_first_search
+from move_list import moves_from_parents
+from typing import Callable, Dict, Tuple, List, Optional, Union
 
 
-def uniform_cost(initial_state: PancakeStack, goal_state: PancakeStack) -> \
-        Optional[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack]]:
+def uniform_cost(initial_state: PancakeStack, goal_state: PancakeStack,
+                 frontier_type: Callable[[], CakeHeap] = CakeHeap,
+                 stats: Optional[SearchStats] = None,
+                 compact: bool = False) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
     """
     Given an initial state and a goal state finds a series of flips to get
     from the initial state to the goal using the uniform cost algorithm.
     :param initial_state: The initial state to get to the goal from.
     :param goal_state: The goal state to get to from the initial state.
+    :param frontier_type: Creates the priority queue used as the frontier:
+    CakeHeap (the default) or BucketQueue.
+    :param stats: Filled in with statistics about the search if given.
+    :param compact: If true only the keys of states are kept during the
+    search, and the solution is returned as a list of flips (see move_list)
+    instead of a dictionary of states.
     :return: A tuple containing: a dictionary where each key is a state, and
-    each value is that state's parent, and the goal state. None is returned if
-    no path is found.
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
     """
-    frontier: CakeHeap = CakeHeap()
-    visited: List = []
-    path: Dict[PancakeStack, PancakeStack] = {initial_state: None}
-    frontier.push(initial_state, 0)
-
-    while not frontier.empty():
-        current_state: PancakeStack = frontier.pop()
-        visited.append(current_state)
-        if goal_state == current_state:
-            return path, current_state
-        children: List[PancakeStack] = current_state.children()
-        for child in children:  # type: PancakeStack
-            if child not in visited and child not in frontier:
-                frontier.push(child, child.cost_to_self())
-                path[child] = current_state
-            elif child in frontier and frontier[child].cost_to_self() > \
-                    child.cost_to_self():
-                frontier.remove(child)
-                frontier.push(child, child.cost_to_self())
-                path[child] = current_state
-    return None
+    result = best_first_search(initial_state,
+                               goal_state.__eq__,
+                               PancakeStack.children,
+                               PancakeStack.step_cost,
+                               PancakeStack.heuristic_cost,
+                               h_weight=0,
+                               frontier_type=frontier_type,
+                               stats=stats,
+                               key=PancakeStack.get_key if compact else None)
+    if compact and result is not None:
+        return moves_from_parents(result[0], result[1].get_key())
+    return result
@@ -0,0 +1,50 @@
+from pancake_stack import PancakeStack
+from pancake_heuristics import PancakeHeuristic
+from search_stats import SearchStats
+from best_first import best_first_search
+from move_list import moves_from_parents
+from typing import Dict, Tuple, List, Optional, Union
+
+# The default amount the heuristic is inflated by.
+DEFAULT_EPSILON: float = 1.0
+
+
+def weighted_a_star(initial_state: PancakeStack, goal_state: PancakeStack,
+                    epsilon: float = DEFAULT_EPSILON,
+                    heuristic: Optional[PancakeHeuristic] = None,
+                    stats: Optional[SearchStats] = None,
+                    compact: bool = False) -> \
+        Optional[Union[Tuple[Dict[PancakeStack, PancakeStack], PancakeStack],
+                       List[int]]]:
+    """
+    Given an initial state and a goal state finds a series of flips to get
+    from the initial state to the goal using weighted a*. The heuristic is
+    multiplied by (1 + epsilon), which expands far fewer states than a* while
+    guaranteeing (given an admissible heuristic) a solution that costs at most
+    (1 + epsilon) times the optimal one.
+    :param initial_state: The initial state to get to the goal from.
+    :param goal_state: The goal state to get to from the initial state.
+    :param epsilon: How suboptimal the solution is allowed to be.
+    :param heuristic: The heuristic to guide the search with. Defaults to the
+    heuristic the initial state was created with.
+    :param stats: Filled in with statistics about the search if given.
+    :param compact: If true only the keys of states are kept during the
+    search, and the solution is returned as a list of flips (see move_list)
+    instead of a dictionary of states.
+    :return: A tuple containing: a dictionary where each key is a state, and
+    each value is that state's parent, and the goal state, or the list of
+    flips in compact mode. None is returned if no path is found.
+    """
+    if heuristic is not None:
+        initial_state = initial_state.with_heuristic(heuristic)
+    result = best_first_search(initial_state,
+                               goal_state.__eq__,
+                               PancakeStack.children,
+                               PancakeStack.step_cost,
+                               PancakeStack.heuristic_cost,
+                               h_weight=1 + epsilon,
+                               stats=stats,
+                               key=PancakeStack.get_key if compact else None)
+    if compact and result is not None:
+        return moves_from_parents(result[0], result[1].get_key())
+    return result
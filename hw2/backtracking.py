@@ -0,0 +1,205 @@
+import random
+from sudoku_board import SudokuBoard
+from sudoku_tile import SudokuTile
+from solve_stats import SolveStats
+from typing import Callable, List, Optional, Tuple
+
+# Puts the possible values of a tile in the order to try them in.
+ValueOrdering = Callable[[Tuple[int, ...]], Tuple[int, ...]]
+
+
+def reversed_values(values: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Orders values the opposite way to the tile.
+    :param values: The possible values of a tile, in the tile's order.
+    :return: The values in reverse order.
+    """
+    return values[::-1]
+
+
+class ShuffledValues:
+    """
+    Orders values randomly. Seeded, so a search can be repeated, and a
+    class rather than a closure so that it can be sent to other processes.
+    """
+
+    def __init__(self, seed: int):
+        """
+        Initializes the ordering.
+        :param seed: The seed of the random numbers.
+        """
+        self._random: random.Random = random.Random(seed)
+
+    def __call__(self, values: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        Orders values randomly.
+        :param values: The possible values of a tile.
+        :return: The values in a random order.
+        """
+        return tuple(self._random.sample(values, len(values)))
+
+
+class BacktrackingSearch:
+    """
+    Backtracking search for Sudoku driven by an explicit stack of choices
+    rather than by recursion. It searches exactly like the recursive version
+    (propagation before every choice, then the tile with the minimum
+    remaining values), but avoids a Python call per tile, has no recursion
+    limit to run into on large boards, and keeps all of its state in the
+    object, so searches on different boards can run in different threads.
+
+    Since the stack is kept between calls, a search can be paused after a
+    number of steps and resumed later, and can carry on past a solution to
+    look for the next one.
+
+    Each entry on the stack is a choice point: the board's mark from before
+    the tile's propagation, the tile, its possible values, and how many of
+    them have been tried.
+    """
+
+    def __init__(self,
+                 board: SudokuBoard,
+                 propagation: bool = True,
+                 naked_pairs: bool = False,
+                 stats: Optional[SolveStats] = None,
+                 order_values: Optional[ValueOrdering] = None):
+        """
+        Initializes the search. Nothing is searched until run is called.
+        :param board: The SudokuBoard to search. It must not be changed by
+        anything else while the search is unfinished.
+        :param propagation: Whether to propagate constraints before every
+        choice.
+        :param naked_pairs: Whether propagation also looks for naked pairs.
+        :param stats: Where to count backtracks and assignments. A new
+        SolveStats is used if not given.
+        :param order_values: The order to try the possible values of each
+        tile in. The tile's own order if not given.
+        """
+        self._board: SudokuBoard = board
+        self._propagation: bool = propagation
+        self._naked_pairs: bool = naked_pairs
+        self.stats: SolveStats = SolveStats() if stats is None else stats
+        self._order_values: Optional[ValueOrdering] = order_values
+        self._stack: List[List] = []
+        # The mark to undo to once the search is over, and whether it has
+        # started.
+        self._root: int = -1
+        # Whether the next step enters a new choice point, as opposed to
+        # trying the next value of the one on top of the stack.
+        self._descend: bool = True
+        # The mark of the solution the search stopped at, if it did.
+        self._solution: Optional[int] = None
+        self._finished: bool = False
+
+    def finished(self) -> bool:
+        """
+        Whether or not the whole search space has been searched.
+        :return: True if there are no more solutions to find, false otherwise.
+        """
+        return self._finished
+
+    def run(self, max_steps: Optional[int] = None) -> Optional[SudokuBoard]:
+        """
+        Searches for the next solution. Each call picks up where the last one
+        stopped, so after a solution it looks for the one after it, and after
+        running out of steps it carries on.
+        :param max_steps: The most values to assign by choice before pausing,
+        or None to run until a solution is found or the search is finished.
+        :return: The board, solved, if a solution was found. None if the
+        search paused or finished (see finished).
+        """
+        board: SudokuBoard = self._board
+        stack: List[List] = self._stack
+        stats: SolveStats = self.stats
+        propagation: bool = self._propagation
+        naked_pairs: bool = self._naked_pairs
+        order_values: Optional[ValueOrdering] = self._order_values
+        if self._finished:
+            return None
+        if self._root < 0:
+            self._root = board.mark()
+            if not board.consistent():
+                self._finished = True
+                return None
+        descend: bool = self._descend
+        if self._solution is not None:
+            # Leave the last solution and try the next value above it.
+            board.undo(self._solution)
+            self._solution = None
+            descend = False
+        # The board's methods, looked up once since they are called on every
+        # step.
+        assign: Callable[[SudokuTile, int], None] = board.assign
+        unassign: Callable[[SudokuTile], None] = board.unassign
+        # The number of steps left before pausing, -1 to never pause.
+        steps: int = -1 if max_steps is None else max_steps
+        while True:
+            if descend:
+                mark: int = board.mark()
+                propagated: Optional[int] = 0
+                if propagation:
+                    propagated = board.propagate(naked_pairs)
+                if propagated is None:
+                    board.undo(mark)
+                    stats.backtracks += 1
+                else:
+                    stats.assignments += propagated
+                    if board.complete() is True:
+                        self._solution = mark
+                        return board
+                    tile: SudokuTile = board.next_tile()
+                    values: Tuple[int, ...] = tile.possible_values()
+                    if order_values is not None:
+                        values = order_values(values)
+                    stack.append([mark, tile, values, 0])
+            if not stack:
+                self._finished = True
+                return None
+            # Try the next value of the tile on top of the stack, if there
+            # is one left.
+            choice: List = stack[-1]
+            tile = choice[1]
+            values = choice[2]
+            position: int = choice[3]
+            if position < len(values):
+                if steps == 0:
+                    self._descend = False
+                    return None
+                if position:
+                    unassign(tile)
+                assign(tile, values[position])
+                choice[3] = position + 1
+                stats.assignments += 1
+                steps -= 1
+                descend = True
+            else:
+                if position:
+                    unassign(tile)
+                stack.pop()
+                board.undo(choice[0])
+                stats.backtracks += 1
+                descend = False
+
+    def stop(self) -> None:
+        """
+        Abandons the search, putting the board back the way it was given.
+        :return: None.
+        """
+        if self._root >= 0:
+            self._board.undo(self._root)
+        self._stack.clear()
+        self._solution = None
+        self._finished = True
+
+    def count(self, limit: int = 2) -> int:
+        """
+        Counts the solutions, stopping as soon as limit of them are found. The
+        board is put back the way it was given afterwards.
+        :param limit: The number of solutions to stop at.
+        :return: The number of solutions found, at most limit.
+        """
+        count: int = 0
+        while count < limit and self.run() is not None:
+            count += 1
+        self.stop()
+        return count
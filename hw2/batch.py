@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, Future, wait, \
+    FIRST_COMPLETED
+import main
+from sudoku_board import SudokuBoard
+from solve_stats import SolveStats
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+# The number of puzzles handed to a worker at a time.
+DEFAULT_CHUNK_SIZE: int = 64
+# The number of chunks handed out per worker before waiting on results.
+PENDING_PER_WORKER: int = 2
+
+
+def solve_puzzle(line_number: int, line: str, solver: str,
+                 count_limit: int = 0) -> str:
+    """
+    Solves the puzzle on one line of input, or counts its solutions.
+    :param line_number: The (1-based) number of the line in the input.
+    :param line: The line of input, the tiles in row major order with 0 or .
+    for the tiles to solve (see main.convert_to_board).
+    :param solver: The name of the solver to use.
+    :param count_limit: If more than 0, the puzzle's solutions are counted up
+    to this many instead of solving it.
+    :return: The result as a line of JSON.
+    """
+    result: Dict = {'line': line_number}
+    rows: Optional[List[List[int]]] = main.convert_to_board(line)
+    if rows is None:
+        result['error'] = 'Not a valid puzzle: {}'.format(line.strip())
+        return json.dumps(result)
+
+    stats: SolveStats = SolveStats()
+    stats.start()
+    # A solver failing on one puzzle only fails that puzzle's line, not the
+    # rest of its chunk.
+    try:
+        if count_limit > 0:
+            result['solutions'] = main.COUNTERS[solver](
+                SudokuBoard(rows), count_limit, stats=stats)
+            answer: Optional[SudokuBoard] = None
+        else:
+            answer = main.SOLVERS[solver](SudokuBoard(rows), stats=stats)
+    except Exception as error:
+        result['error'] = 'Solver failed: {!r}'.format(error)
+        return json.dumps(result)
+    stats.finish()
+    result.update(stats.as_dict())
+    if count_limit > 0:
+        return json.dumps(result)
+    if answer is None:
+        result['error'] = 'No solution'
+    else:
+        result['solution'] = ''.join(tile.symbol()
+                                     for tile in answer.all_tiles())
+    return json.dumps(result)
+
+
+def solve_chunk(chunk: List[Tuple[int, str]], solver: str,
+                count_limit: int = 0) -> List[str]:
+    """
+    Solves a chunk of puzzles one after the other.
+    :param chunk: The number of each line of input and the line.
+    :param solver: The name of the solver to use.
+    :param count_limit: If more than 0, the solutions of each puzzle are
+    counted up to this many instead (see solve_puzzle).
+    :return: The result for each puzzle as a line of JSON, in order.
+    """
+    return [solve_puzzle(line_number, line, solver, count_limit)
+            for line_number, line in chunk]
+
+
+def solve_all(lines: TextIO, output: TextIO, solver: str, workers: int,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              count_limit: int = 0) -> None:
+    """
+    Solves every puzzle in the input over a pool of worker processes, writing
+    the results of each chunk of puzzles as soon as it is done. Chunks are
+    written in the order they finish in, not the order of the input, and only
+    a few chunks per worker are read ahead so the input can be streamed.
+    :param lines: The input, one puzzle per line. Blank lines are skipped.
+    :param output: Where to write the results, one line of JSON per puzzle.
+    :param solver: The name of the solver to use.
+    :param workers: The number of worker processes.
+    :param chunk_size: The number of puzzles handed to a worker at a time.
+    :param count_limit: If more than 0, the solutions of each puzzle are
+    counted up to this many instead (see solve_puzzle).
+    :return: None.
+    """
+    # The line numbers of the puzzles in each chunk being solved.
+    line_numbers: Dict[Future, List[int]] = {}
+
+    def write_done(done: Set[Future]) -> None:
+        """
+        Writes the results of the given finished chunks. Every puzzle of a
+        chunk whose worker failed (for example by running out of memory)
+        gets an error line.
+        :param done: The finished chunks.
+        :return: None.
+        """
+        for future in done:  # type: Future
+            chunk_lines: List[int] = line_numbers.pop(future)
+            try:
+                results: List[str] = future.result()
+            except Exception as error:
+                results = [json.dumps(
+                    {'line': line_number,
+                     'error': 'Solver failed: {!r}'.format(error)})
+                    for line_number in chunk_lines]
+            for result in results:  # type: str
+                output.write(result + '\n')
+        output.flush()
+
+    def submit(executor: ProcessPoolExecutor,
+               chunk: List[Tuple[int, str]]) -> Future:
+        """
+        Hands a chunk of puzzles to a worker.
+        :param executor: The pool of workers.
+        :param chunk: The number of each line of input and the line.
+        :return: The chunk being solved.
+        """
+        future: Future = executor.submit(solve_chunk, chunk, solver,
+                                         count_limit)
+        line_numbers[future] = [line_number for line_number, _ in chunk]
+        return future
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Set[Future] = set()
+        chunk: List[Tuple[int, str]] = []
+        for line_number, line in enumerate(lines, 1):  # type: int, str
+            if not line.strip():
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) < chunk_size:
+                continue
+            pending.add(submit(executor, chunk))
+            chunk = []
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write_done(done)
+        if chunk:
+            pending.add(submit(executor, chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write_done(done)
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+    :param arguments: The command line arguments, without the program name.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Solves many Sudoku puzzles in parallel. Each line of the '
+                    'input is a puzzle: its tiles in row major order, with '
+                    '0 or . for the tiles to solve. Puzzles can be 9 by 9 '
+                    '(81 tiles), 16 by 16 (256) or 25 by 25 (625), with '
+                    'values above 9 written as A, B, C and so on. Each line '
+                    'of the output is the solution to one puzzle as JSON, '
+                    'with the number of backtracks and assignments it took.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='File to read puzzles from, - for stdin '
+                             '(the default).')
+    parser.add_argument('-o', '--output', default='-',
+                        help='File to write solutions to, - for stdout '
+                             '(the default).')
+    parser.add_argument('-s', '--solver', default='backtracking',
+                        choices=sorted(main.SOLVERS),
+                        help='The solver to use (default: backtracking).')
+    parser.add_argument('-w', '--workers', type=main.positive_int,
+                        default=os.cpu_count(),
+                        help='The number of worker processes (default: the '
+                             'number of CPUs).')
+    parser.add_argument('-c', '--chunk-size', type=main.positive_int,
+                        default=DEFAULT_CHUNK_SIZE,
+                        help='The number of puzzles handed to a worker at a '
+                             'time (default: {}).'.format(DEFAULT_CHUNK_SIZE))
+    parser.add_argument('-n', '--count', type=main.positive_int, default=0,
+                        metavar='LIMIT',
+                        help='Count the solutions of each puzzle, stopping at '
+                             'LIMIT, instead of solving it. 2 checks that '
+                             'each puzzle has exactly one solution.')
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    args: argparse.Namespace = parse_arguments(sys.argv[1:])
+    input_file: TextIO = sys.stdin if args.input == '-' \
+        else open(args.input)
+    output_file: TextIO = sys.stdout if args.output == '-' \
+        else open(args.output, 'w')
+    try:
+        solve_all(input_file, output_file, args.solver, args.workers,
+                  args.chunk_size, args.count)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
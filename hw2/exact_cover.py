@@ -0,0 +1,216 @@
+from typing import Iterator, List, Sequence
+
+
+class DancingLinks:
+    """
+    Solves exact cover problems with Knuth's Algorithm X using dancing links:
+    given a matrix of 0s and 1s, picks a set of rows with exactly one 1 in
+    every column.
+
+    The 1s are nodes in circular doubly linked lists, one list per row and
+    one per column, with a header node for each column in a list of the
+    columns still to cover. Covering a column unlinks it and every row with a
+    1 in it, and uncovering links them back in the opposite order, so
+    backtracking needs no copies. The links are kept in parallel lists of
+    ints rather than as node objects, which is much faster in Python. Node 0
+    is the root of the header list and nodes 1 to the number of columns are
+    the column headers.
+    """
+
+    def __init__(self, columns: int):
+        """
+        Initializes an exact cover problem with no rows.
+        :param columns: The number of columns of the matrix.
+        """
+        headers: range = range(columns + 1)
+        self._left: List[int] = [i - 1 for i in headers]
+        self._left[0] = columns
+        self._right: List[int] = [i + 1 for i in headers]
+        self._right[columns] = 0
+        self._up: List[int] = list(headers)
+        self._down: List[int] = list(headers)
+        self._column: List[int] = list(headers)
+        # The number of rows left in each column, by header node.
+        self._sizes: List[int] = [0] * (columns + 1)
+        # The row each node is in (-1 for the headers).
+        self._row: List[int] = [-1] * (columns + 1)
+        # The first node of each row.
+        self._first: List[int] = []
+        # Whether each column (by header node) is covered.
+        self._covered: List[bool] = [False] * (columns + 1)
+        # The rows selected by select, before any search.
+        self._selected: List[int] = []
+        # The number of rows tried by the search.
+        self.assignments: int = 0
+        # The number of times the search ran out of rows to try for a column.
+        self.backtracks: int = 0
+
+    def add_row(self, columns: Sequence[int]) -> int:
+        """
+        Adds a row to the matrix. Rows can not be added once the search has
+        started.
+        :param columns: The (0-based) columns the row has a 1 in.
+        :return: The number of the new row, starting from 0.
+        """
+        row: int = len(self._first)
+        first: int = len(self._column)
+        for offset, column in enumerate(columns):  # type: int, int
+            node: int = first + offset
+            header: int = column + 1
+            self._left.append(node - 1 if offset else first + len(columns) - 1)
+            self._right.append(node + 1 if offset < len(columns) - 1
+                               else first)
+            self._up.append(self._up[header])
+            self._down.append(header)
+            self._down[self._up[header]] = node
+            self._up[header] = node
+            self._column.append(header)
+            self._row.append(row)
+            self._sizes[header] += 1
+        self._first.append(first)
+        return row
+
+    def copy(self) -> 'DancingLinks':
+        """
+        Gets a copy of this problem, including its selected rows but not its
+        counters, so that a matrix can be built once and solved many times.
+        The copy shares the layout of the rows with this problem, so rows can
+        not be added to either one afterwards.
+        :return: The copy.
+        """
+        copy: DancingLinks = DancingLinks(0)
+        copy._left = list(self._left)
+        copy._right = list(self._right)
+        copy._up = list(self._up)
+        copy._down = list(self._down)
+        copy._column = self._column
+        copy._sizes = list(self._sizes)
+        copy._row = self._row
+        copy._first = self._first
+        copy._covered = list(self._covered)
+        copy._selected = list(self._selected)
+        return copy
+
+    def select(self, row: int) -> bool:
+        """
+        Puts a row in every solution, for example a clue of a puzzle, by
+        covering its columns before searching.
+        :param row: The number of the row to select.
+        :return: True if the row could be selected, false if one of its
+        columns is already covered by another selected row (in which case
+        there is no solution).
+        """
+        node: int = self._first[row]
+        while True:
+            if self._covered[self._column[node]]:
+                return False
+            node = self._right[node]
+            if node == self._first[row]:
+                break
+        while True:
+            self.__cover(self._column[node])
+            node = self._right[node]
+            if node == self._first[row]:
+                break
+        self._selected.append(row)
+        return True
+
+    def solutions(self) -> Iterator[List[int]]:
+        """
+        Searches for every solution. Each column to cover next is the one
+        with the fewest rows left (the minimum remaining values heuristic).
+        :return: The solutions as they are found, each a list of the numbers
+        of the rows in it, including the selected rows.
+        """
+        solution: List[int] = list(self._selected)
+        yield from self.__search(solution)
+
+    def __search(self, solution: List[int]) -> Iterator[List[int]]:
+        """
+        Searches for every solution that extends the given partial one.
+        :param solution: The rows picked so far. Changed during the search,
+        but restored before returning.
+        :return: The solutions as they are found.
+        """
+        right: List[int] = self._right
+        left: List[int] = self._left
+        down: List[int] = self._down
+        sizes: List[int] = self._sizes
+        if right[0] == 0:
+            yield list(solution)
+            return
+        column: int = right[0]
+        header: int = right[column]
+        while header != 0:
+            if sizes[header] < sizes[column]:
+                column = header
+            header = right[header]
+        if sizes[column] == 0:
+            self.backtracks += 1
+            return
+
+        self.__cover(column)
+        node: int = down[column]
+        while node != column:
+            solution.append(self._row[node])
+            self.assignments += 1
+            other: int = right[node]
+            while other != node:
+                self.__cover(self._column[other])
+                other = right[other]
+            yield from self.__search(solution)
+            other = left[node]
+            while other != node:
+                self.__uncover(self._column[other])
+                other = left[other]
+            solution.pop()
+            node = down[node]
+        self.__uncover(column)
+        self.backtracks += 1
+
+    def __cover(self, column: int) -> None:
+        """
+        Removes a column from the header list, and every row with a 1 in it
+        from the other columns.
+        :param column: The header node of the column.
+        :return: Nothing.
+        """
+        left: List[int] = self._left
+        right: List[int] = self._right
+        up: List[int] = self._up
+        down: List[int] = self._down
+        left[right[column]] = left[column]
+        right[left[column]] = right[column]
+        self._covered[column] = True
+        node: int = down[column]
+        while node != column:
+            other: int = right[node]
+            while other != node:
+                up[down[other]] = up[other]
+                down[up[other]] = down[other]
+                self._sizes[self._column[other]] -= 1
+                other = right[other]
+            node = down[node]
+
+    def __uncover(self, column: int) -> None:
+        """
+        Undoes __cover, in exactly the opposite order.
+        :param column: The header node of the column.
+        :return: Nothing.
+        """
+        left: List[int] = self._left
+        right: List[int] = self._right
+        up: List[int] = self._up
+        down: List[int] = self._down
+        node: int = up[column]
+        while node != column:
+            other: int = left[node]
+            while other != node:
+                self._sizes[self._column[other]] += 1
+                up[down[other]] = other
+                down[up[other]] = other
+                other = left[other]
+            node = up[node]
+        self._covered[column] = False
+        left[right[column]] = column
+        right[left[column]] = column
@@ -1,6 +1,12 @@
+import argparse
+import sys
 from sudoku_board import SudokuBoard
-from sudoku_tile import SudokuTile
-from typing import Set, Optional
+from sudoku_tile import SudokuTile, SYMBOLS
+from backtracking import BacktrackingSearch
+from exact_cover import DancingLinks
+from solve_stats import SolveStats
+from parallel import parallel_backtracking, portfolio_backtracking
+from typing import Callable, Dict, List, Optional, Tuple
 
 # The easy board.
 EASY_BOARD = [
@@ -50,10 +56,46 @@ UNSOLVABLE_BOARD = [
     [0, 0, 8, 5, 0, 0, 0, 1, 0],
     [0, 9, 0, 0, 0, 0, 4, 0, 0]]
 
-# Keeps track of the number of backtracks the algorithm performs
-number_of_backtracks: int = 0
-# Keeps track of the number of variable assignments the algorithm performs.
-number_of_variable_assignments:int = 0
+# Arto Inkala's board with a 2 that does not belong in it: no value is given
+# twice, so only searching every choice shows it has no solution.
+DEAD_END_BOARD = [
+    [8, 2, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 3, 6, 0, 0, 0, 0, 0],
+    [0, 7, 0, 0, 9, 0, 2, 0, 0],
+    [0, 5, 0, 0, 0, 7, 0, 0, 0],
+    [0, 0, 0, 0, 4, 5, 7, 0, 0],
+    [0, 0, 0, 1, 0, 0, 0, 3, 0],
+    [0, 0, 1, 0, 0, 0, 0, 6, 8],
+    [0, 0, 8, 5, 0, 0, 0, 1, 0],
+    [0, 9, 0, 0, 0, 0, 4, 0, 0]]
+
+
+def convert_to_board(line: str) -> Optional[List[List[int]]]:
+    """
+    Converts a puzzle written on one line, the tiles in row major order with
+    0 or . for the tiles to solve, into a board in row orientation. The size
+    of the board follows from the length of the line: 81 tiles for 9 by 9,
+    256 for 16 by 16 and 625 for 25 by 25, with values above 9 written as
+    letters (see SYMBOLS).
+    :param line: The line to convert.
+    :return: The board if successful, None otherwise.
+    """
+    line = line.strip()
+    box_size: int = int(round(len(line) ** 0.25))
+    size: int = box_size * box_size
+    if size * size != len(line) or not 0 < size <= len(SYMBOLS):
+        return None
+    values: List[int] = []
+    for character in line.upper():  # type: str
+        value: int = SYMBOLS.find(character) + 1
+        if character in '.0':
+            values.append(0)
+        elif 0 < value <= size:
+            values.append(value)
+        else:
+            return None
+    return [values[i:i + size] for i in range(0, size * size, size)]
+
 
 def greet_user(board: SudokuBoard) -> None:
     """
@@ -67,11 +109,14 @@ def greet_user(board: SudokuBoard) -> None:
           "that I will solve (if it is 0) or have solved (if it is not 0) \n"
           "for this value. It is possible that colors will not work in your\n"
           "terminal, if so just refer to the numbers that change from 0 to\n"
-          "some number between 1-9.\n")
+          "some number between 1-{}.\n"
+          .format(SYMBOLS[board.size() - 1]))
 
-def display_answer(board: SudokuBoard) -> None:
+def display_answer(board: SudokuBoard, stats: SolveStats) -> None:
     """
     Displays the answer
+    :param board: The solved board, or None if there was no solution.
+    :param stats: The statistics of the solve.
     :return: None.
     """
     if board is not None:
@@ -80,21 +125,40 @@ def display_answer(board: SudokuBoard) -> None:
     else:
         print("The given board was not solvable. Or I'm getting demoted to "
               "the Sudoku-Solver-8000.")
-    print("\nThe number of times this algorithm backtracked is: " +
-          str(number_of_backtracks) + ".")
-    print("The number of times this algorithm assigned a value to a variable"
-          " is: " + str(number_of_variable_assignments) + ".")
+    print()
+    print(stats)
 
 
-def recursive_backtracking(board: SudokuBoard) -> Optional[SudokuBoard]:
+def recursive_backtracking(board: SudokuBoard,
+                           propagation: bool = True,
+                           naked_pairs: bool = False,
+                           stats: Optional[SolveStats] = None) \
+        -> Optional[SudokuBoard]:
     """
     Recursive backtracking algorithm for solving Sudoku. It uses a form of
-    Forward Checking and Minimum Remaining Values to speed up the process.
+    Forward Checking and Minimum Remaining Values to speed up the process,
+    and propagates constraints (naked and hidden singles) before every
+    choice. backtracking searches the same way without recursing.
     :param board: The SudokuBoard to solve.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count backtracks and assignments.
     :return: The solved SudokuBoard is possible, None otherwise.
     """
-    global number_of_backtracks
-    global number_of_variable_assignments
+    if stats is None:
+        stats = SolveStats()
+    if not board.consistent():
+        return None
+    # Fill in every tile that follows from the tiles assigned so far, and
+    # remember where to undo to if this branch fails.
+    mark: int = board.mark()
+    if propagation:
+        propagated: Optional[int] = board.propagate(naked_pairs)
+        if propagated is None:
+            board.undo(mark)
+            stats.backtracks += 1
+            return None
+        stats.assignments += propagated
     # If the board is complete, return it.
     if board.complete() is True:
         return board
@@ -105,14 +169,15 @@ def recursive_backtracking(board: SudokuBoard) -> Optional[SudokuBoard]:
         # This grabs the possible values available for the current tile
         # A form of forward checking -- eliminating possibilities that will
         # will break the constraints right away.
-        possible_values: Set[int] = tile.possible_values()
+        possible_values: Tuple[int, ...] = tile.possible_values()
         for value in possible_values:  # type: int
             # Attempt to assign a value
             board.assign(tile, value)
             # Keep track of number of variable assignments for output
-            number_of_variable_assignments += 1
+            stats.assignments += 1
             # Attempt to go through the process for the rest of the tiles
-            result = recursive_backtracking(board)
+            result = recursive_backtracking(board, propagation, naked_pairs,
+                                            stats)
             # If it worked
             if result is not None:
                 # Return the result!
@@ -123,13 +188,275 @@ def recursive_backtracking(board: SudokuBoard) -> Optional[SudokuBoard]:
             # are no more possible value for this tile we return None and try
             # reassigning the variable before this.
         # Keep track of number of backtracks for output.
-        number_of_backtracks += 1
-        return None
+        stats.backtracks += 1
+    board.undo(mark)
     return None
 
 
+def backtracking(board: SudokuBoard,
+                 propagation: bool = True,
+                 naked_pairs: bool = False,
+                 stats: Optional[SolveStats] = None) -> Optional[SudokuBoard]:
+    """
+    Solves Sudoku the same way as recursive_backtracking, but with an
+    explicit stack of choices instead of recursion (see BacktrackingSearch).
+    :param board: The SudokuBoard to solve.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count backtracks and assignments.
+    :return: The solved SudokuBoard is possible, None otherwise.
+    """
+    return BacktrackingSearch(board, propagation, naked_pairs, stats).run()
+
+
+def count_solutions(board: SudokuBoard,
+                    limit: int = 2,
+                    propagation: bool = True,
+                    naked_pairs: bool = False,
+                    stats: Optional[SolveStats] = None) -> int:
+    """
+    Counts the solutions of a board, searching the same way as backtracking
+    but carrying on past the first solution until limit solutions are found.
+    With the default limit of 2 this checks whether a puzzle has exactly one
+    solution for little more than the cost of solving it. The board is left
+    the way it was given.
+    :param board: The SudokuBoard to count the solutions of.
+    :param limit: The number of solutions to stop at.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count backtracks and assignments.
+    :return: The number of solutions, at most limit.
+    """
+    return BacktrackingSearch(board, propagation, naked_pairs, stats) \
+        .count(limit)
+
+
+def recursive_count_solutions(board: SudokuBoard,
+                              limit: int = 2,
+                              propagation: bool = True,
+                              naked_pairs: bool = False,
+                              stats: Optional[SolveStats] = None) -> int:
+    """
+    Counts the solutions of a board the same way as count_solutions, but
+    searching like recursive_backtracking. The board is left the way it was
+    given.
+    :param board: The SudokuBoard to count the solutions of.
+    :param limit: The number of solutions to stop at.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count backtracks and assignments.
+    :return: The number of solutions, at most limit.
+    """
+    if stats is None:
+        stats = SolveStats()
+    if limit <= 0 or not board.consistent():
+        return 0
+    mark: int = board.mark()
+    if propagation:
+        propagated: Optional[int] = board.propagate(naked_pairs)
+        if propagated is None:
+            board.undo(mark)
+            stats.backtracks += 1
+            return 0
+        stats.assignments += propagated
+    if board.complete() is True:
+        board.undo(mark)
+        return 1
+    count: int = 0
+    tile: SudokuTile = board.next_tile()
+    if tile is not None:
+        for value in tile.possible_values():  # type: int
+            board.assign(tile, value)
+            stats.assignments += 1
+            count += recursive_count_solutions(board, limit - count,
+                                               propagation, naked_pairs,
+                                               stats)
+            board.unassign(tile)
+            # Stop as soon as there are enough solutions, rather than
+            # trying the rest of the values.
+            if count >= limit:
+                break
+        else:
+            stats.backtracks += 1
+    board.undo(mark)
+    return count
+
+
+def sudoku_matrix(size: int, box_size: int) -> DancingLinks:
+    """
+    Builds the exact cover matrix of an empty Sudoku board. Every row of the
+    matrix puts one value in one tile: row number (tile * size + value - 1)
+    puts value in the tile with the given (row major) index. There is a
+    column for every tile (it needs a value), and for every value in every
+    row, column and box (it needs the value once).
+    :param size: Both the length and width of the board.
+    :param box_size: Both the length and width of a box within the board.
+    :return: The exact cover matrix.
+    """
+    cells: int = size * size
+    links: DancingLinks = DancingLinks(4 * cells)
+    for tile_index in range(cells):  # type: int
+        i, j = divmod(tile_index, size)  # type: int, int
+        box: int = (i // box_size) * box_size + j // box_size
+        for value in range(size):  # type: int
+            links.add_row((tile_index,
+                           cells + i * size + value,
+                           2 * cells + j * size + value,
+                           3 * cells + box * size + value))
+    return links
+
+
+# The exact cover matrix of an empty board of each size, built the first time
+# it is needed.
+_sudoku_matrices: Dict[int, DancingLinks] = {}
+
+
+def board_matrix(board: SudokuBoard) -> Optional[DancingLinks]:
+    """
+    Gets the exact cover matrix of a board (see sudoku_matrix), with the
+    given tiles selected up front.
+    :param board: The SudokuBoard to get the matrix of.
+    :return: The matrix, or None if the given tiles already break the rules.
+    """
+    size: int = board.size()
+    if size not in _sudoku_matrices:
+        _sudoku_matrices[size] = sudoku_matrix(size, board.box_size())
+    links: DancingLinks = _sudoku_matrices[size].copy()
+    tiles: List[SudokuTile] = board.all_tiles()
+    for tile_index, tile in enumerate(tiles):  # type: int, SudokuTile
+        if tile.value() != 0 and \
+                not links.select(tile_index * size + tile.value() - 1):
+            return None
+    return links
+
+
+def dancing_links(board: SudokuBoard,
+                  stats: Optional[SolveStats] = None) -> Optional[SudokuBoard]:
+    """
+    Solves Sudoku as an exact cover problem with dancing links (see
+    sudoku_matrix). The given tiles are selected up front.
+    The counters count rows tried and columns that ran out of rows, which
+    correspond to assignments and backtracks of recursive_backtracking.
+    :param board: The SudokuBoard to solve.
+    :param stats: Where to count backtracks and assignments.
+    :return: The solved SudokuBoard is possible, None otherwise.
+    """
+    if stats is None:
+        stats = SolveStats()
+    size: int = board.size()
+    links: Optional[DancingLinks] = board_matrix(board)
+    if links is None:
+        return None
+    tiles: List[SudokuTile] = board.all_tiles()
+    solution: Optional[List[int]] = next(links.solutions(), None)
+    stats.backtracks += links.backtracks
+    stats.assignments += links.assignments
+    if solution is None:
+        return None
+    for row in solution:  # type: int
+        tile_index, value = divmod(row, size)  # type: int, int
+        if tiles[tile_index].value() == 0:
+            board.assign(tiles[tile_index], value + 1)
+    return board
+
+
+def dancing_links_count(board: SudokuBoard,
+                        limit: int = 2,
+                        stats: Optional[SolveStats] = None) -> int:
+    """
+    Counts the solutions of a board with dancing links, stopping as soon as
+    limit solutions are found (see count_solutions). The board is left the
+    way it was given.
+    :param board: The SudokuBoard to count the solutions of.
+    :param limit: The number of solutions to stop at.
+    :param stats: Where to count backtracks and assignments.
+    :return: The number of solutions, at most limit.
+    """
+    if stats is None:
+        stats = SolveStats()
+    links: Optional[DancingLinks] = board_matrix(board)
+    if links is None or limit <= 0:
+        return 0
+    count: int = 0
+    for _ in links.solutions():
+        count += 1
+        if count >= limit:
+            break
+    stats.backtracks += links.backtracks
+    stats.assignments += links.assignments
+    return count
+
+
+def positive_int(text: str) -> int:
+    """
+    Parses a command line argument that must be a whole number of at least 1,
+    such as a number of worker processes.
+    :param text: The argument.
+    :return: The number.
+    """
+    try:
+        number: int = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            '{!r} is not a whole number'.format(text))
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            'must be at least 1, not {}'.format(number))
+    return number
+
+
+# The solvers that can be picked from the command line. Each takes the board
+# and, as a keyword argument, the SolveStats to count into.
+SOLVERS: Dict[str, Callable[..., Optional[SudokuBoard]]] = {
+    'backtracking': backtracking,
+    'recursive_backtracking': recursive_backtracking,
+    'dancing_links': dancing_links,
+}
+# The ways of counting solutions, by the solver they search like. Each takes
+# the board, the limit and, as a keyword argument, the SolveStats.
+COUNTERS: Dict[str, Callable[..., int]] = {
+    'backtracking': count_solutions,
+    'recursive_backtracking': recursive_count_solutions,
+    'dancing_links': dancing_links_count,
+}
+# The solvers that spread a single puzzle over a pool of worker processes.
+# Each takes the board and, as keyword arguments, the number of workers and
+# the SolveStats. They are not offered to batch.py, which already solves a
+# puzzle per worker.
+PARALLEL_SOLVERS: Dict[str, Callable[..., Optional[SudokuBoard]]] = {
+    'parallel': parallel_backtracking,
+    'portfolio': portfolio_backtracking,
+}
+# The boards that can be picked from the command line.
+BOARDS: Dict[str, List[List[int]]] = {
+    'easy': EASY_BOARD,
+    'evil': EVIL_BOARD,
+    'arto': ARTO_BOARD,
+    'unsolvable': UNSOLVABLE_BOARD,
+    'dead_end': DEAD_END_BOARD,
+}
+
+
 if __name__ == "__main__":
-    my_board: SudokuBoard = SudokuBoard(EVIL_BOARD)
+    parser = argparse.ArgumentParser(description='Solves a Sudoku board.')
+    parser.add_argument('-s', '--solver', default='backtracking',
+                        choices=sorted(SOLVERS) + sorted(PARALLEL_SOLVERS),
+                        help='The solver to use (default: backtracking).')
+    parser.add_argument('-b', '--board', default='evil',
+                        choices=sorted(BOARDS),
+                        help='The board to solve (default: evil).')
+    parser.add_argument('-w', '--workers', type=positive_int, default=None,
+                        help='The number of worker processes of the parallel '
+                             'solvers (default: the number of CPUs).')
+    args: argparse.Namespace = parser.parse_args(sys.argv[1:])
+    my_board: SudokuBoard = SudokuBoard(BOARDS[args.board])
     greet_user(my_board)
-    answer: SudokuBoard = recursive_backtracking(my_board)
-    display_answer(answer)
+    solve_stats: SolveStats = SolveStats()
+    solve_stats.start()
+    if args.solver in PARALLEL_SOLVERS:
+        answer: SudokuBoard = PARALLEL_SOLVERS[args.solver](
+            my_board, workers=args.workers, stats=solve_stats)
+    else:
+        answer = SOLVERS[args.solver](my_board, stats=solve_stats)
+    solve_stats.finish()
+    display_answer(answer, solve_stats)
@@ -0,0 +1,286 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, Future, wait, \
+    FIRST_COMPLETED
+from multiprocessing.synchronize import Event
+from backtracking import BacktrackingSearch, ValueOrdering, ShuffledValues, \
+    reversed_values
+from solve_stats import SolveStats
+from sudoku_board import SudokuBoard
+from sudoku_tile import SudokuTile
+from typing import List, Optional, Sequence, Set, Tuple
+
+# The number of values a worker assigns between checks for whether another
+# worker has already found the answer.
+SLICE_STEPS: int = 1000
+# The number of subproblems to split a puzzle into per worker, so that
+# workers whose subproblems are easy have more to pick up.
+SUBPROBLEMS_PER_WORKER: int = 4
+# The most choices deep a puzzle is split at.
+MAX_SPLIT_DEPTH: int = 4
+
+# A board as rows of values, which is what is sent to and from the workers.
+Rows = List[List[int]]
+# What a worker sends back: the solution it found (None if it found none),
+# whether it searched everything it was given, and the backtracks and
+# assignments it took.
+WorkerResult = Tuple[Optional[Rows], bool, int, int]
+
+# Set once the answer is known, so the workers still searching stop. Each
+# pool has its own, handed to its workers when they start.
+_cancelled: Optional[Event] = None
+
+
+def board_rows(board: SudokuBoard) -> Rows:
+    """
+    Gets the values of a board's tiles in row orientation, 0 for the
+    unassigned tiles.
+    :param board: The board.
+    :return: The values of the tiles.
+    """
+    size: int = board.size()
+    values: List[int] = [tile.value() for tile in board.all_tiles()]
+    return [values[i:i + size] for i in range(0, size * size, size)]
+
+
+def split(rows: Rows, parts: int, propagation: bool, naked_pairs: bool,
+          stats: SolveStats) -> Tuple[Optional[Rows], List[Rows]]:
+    """
+    Splits a puzzle into subproblems at its top choices, the way the search
+    would make them: propagate, then try every possible value of the tile
+    with the minimum remaining values. Whole levels of choices are split
+    until there are at least parts subproblems, or MAX_SPLIT_DEPTH levels.
+    The subproblems are in the order the search would get to them.
+    :param rows: The puzzle.
+    :param parts: The number of subproblems wanted.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count the backtracks and assignments of splitting.
+    :return: A solution if one was found while splitting (None if not), and
+    the subproblems. No subproblems and no solution means no solution.
+    """
+    subproblems: List[Rows] = [rows]
+    for _ in range(MAX_SPLIT_DEPTH):
+        if len(subproblems) >= parts:
+            break
+        children: List[Rows] = []
+        for subproblem in subproblems:  # type: Rows
+            board: SudokuBoard = SudokuBoard(subproblem)
+            if propagation:
+                propagated: Optional[int] = board.propagate(naked_pairs)
+                if propagated is None:
+                    stats.backtracks += 1
+                    continue
+                stats.assignments += propagated
+            if board.complete() is True:
+                return board_rows(board), []
+            tile: SudokuTile = board.next_tile()
+            values: Tuple[int, ...] = tile.possible_values()
+            if not values:
+                stats.backtracks += 1
+            for value in values:  # type: int
+                board.assign(tile, value)
+                stats.assignments += 1
+                children.append(board_rows(board))
+                board.unassign(tile)
+        subproblems = children
+    return None, subproblems
+
+
+def parallel_backtracking(board: SudokuBoard,
+                          workers: Optional[int] = None,
+                          propagation: bool = True,
+                          naked_pairs: bool = False,
+                          stats: Optional[SolveStats] = None) \
+        -> Optional[SudokuBoard]:
+    """
+    Solves one puzzle over a pool of worker processes by splitting its search
+    at the top choices (see split) and searching each subproblem in a worker.
+    Once any worker finds a solution the rest are stopped. Proving there is
+    no solution needs every subproblem searched, spread over the workers.
+    :param board: The SudokuBoard to solve.
+    :param workers: The number of worker processes, at least 1. The number
+    of CPUs if not given.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count backtracks and assignments, summed over
+    every worker.
+    :return: The solved SudokuBoard is possible, None otherwise.
+    """
+    if stats is None:
+        stats = SolveStats()
+    if not board.consistent():
+        return None
+    workers = _worker_count(workers)
+    solution, subproblems = split(board_rows(board),
+                                  workers * SUBPROBLEMS_PER_WORKER,
+                                  propagation, naked_pairs, stats)
+    if solution is None and subproblems:
+        solution = _race([(subproblem, propagation, naked_pairs, None)
+                          for subproblem in subproblems],
+                         workers, False, stats)
+    return _fill_in(board, solution)
+
+
+def portfolio(members: int) -> List[Optional[ValueOrdering]]:
+    """
+    Gets a portfolio of value orderings: the tiles' own order, the reverse
+    of it, and then random orders.
+    :param members: The number of orderings, at least 1.
+    :return: The orderings, None standing for the tiles' own order.
+    """
+    if members < 1:
+        raise ValueError('A portfolio needs at least 1 member, not {}.'
+                         .format(members))
+    orderings: List[Optional[ValueOrdering]] = [None, reversed_values]
+    orderings.extend(ShuffledValues(seed) for seed in range(members - 2))
+    return orderings[:members]
+
+
+def portfolio_backtracking(board: SudokuBoard,
+                           workers: Optional[int] = None,
+                           orderings: Optional[
+                               Sequence[Optional[ValueOrdering]]] = None,
+                           propagation: bool = True,
+                           naked_pairs: bool = False,
+                           stats: Optional[SolveStats] = None) \
+        -> Optional[SudokuBoard]:
+    """
+    Solves one puzzle by racing searches that try values in different orders
+    against each other, one per worker process. The first search to finish,
+    with a solution or with a proof there is none, stops the rest. Luck in
+    the value order is a large part of the cost of hard puzzles, so the
+    race is often won far sooner than one search would finish.
+    :param board: The SudokuBoard to solve.
+    :param workers: The number of worker processes, at least 1. The number
+    of CPUs if not given.
+    :param orderings: The value ordering of each search, None for the tiles'
+    own order. One per worker from portfolio if not given.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param stats: Where to count backtracks and assignments, summed over
+    every worker.
+    :return: The solved SudokuBoard is possible, None otherwise.
+    """
+    if stats is None:
+        stats = SolveStats()
+    if not board.consistent():
+        return None
+    workers = _worker_count(workers)
+    if orderings is None:
+        orderings = portfolio(workers)
+    if not orderings:
+        raise ValueError('A portfolio needs at least 1 ordering.')
+    rows: Rows = board_rows(board)
+    solution: Optional[Rows] = _race(
+        [(rows, propagation, naked_pairs, ordering)
+         for ordering in orderings],
+        workers, True, stats)
+    return _fill_in(board, solution)
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    """
+    Checks the number of worker processes asked for.
+    :param workers: The number of worker processes, or None for the number of
+    CPUs.
+    :return: The number of worker processes.
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('At least 1 worker process is needed, not {}.'
+                         .format(workers))
+    return workers
+
+
+def _race(tasks: List[Tuple[Rows, bool, bool, Optional[ValueOrdering]]],
+          workers: int, any_finished: bool,
+          stats: SolveStats) -> Optional[Rows]:
+    """
+    Runs searches over a pool of worker processes until the answer is known,
+    then stops the rest: cancels those that have not started, and signals
+    those that have to stop at their next check.
+    :param tasks: The arguments of _search for each search.
+    :param workers: The number of worker processes.
+    :param any_finished: Whether any one search finishing decides the
+    answer (when every search covers the whole puzzle), as opposed to only a
+    solution doing so.
+    :param stats: Where to add the backtracks and assignments of every
+    search.
+    :return: The solution found, or None if there is none.
+    """
+    cancelled: Event = multiprocessing.Event()
+    solution: Optional[Rows] = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                             initargs=(cancelled,)) as executor:
+        pending: Set[Future] = {executor.submit(_search, *task)
+                                for task in tasks}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:  # type: Future
+                if future.cancelled():
+                    continue
+                result: WorkerResult = future.result()
+                stats.backtracks += result[2]
+                stats.assignments += result[3]
+                if solution is None:
+                    solution = result[0]
+                if result[0] is not None or (any_finished and result[1]):
+                    cancelled.set()
+            if cancelled.is_set():
+                for future in pending:  # type: Future
+                    future.cancel()
+    return solution
+
+
+def _start_worker(cancelled: Event) -> None:
+    """
+    Sets up a worker process.
+    :param cancelled: Set once the answer is known.
+    :return: None.
+    """
+    global _cancelled
+    _cancelled = cancelled
+
+
+def _search(rows: Rows, propagation: bool, naked_pairs: bool,
+            order_values: Optional[ValueOrdering]) -> WorkerResult:
+    """
+    Searches a puzzle in a worker process, a slice of steps at a time,
+    stopping early if the answer is found elsewhere.
+    :param rows: The puzzle.
+    :param propagation: Whether to propagate constraints before every choice.
+    :param naked_pairs: Whether propagation also looks for naked pairs.
+    :param order_values: The order to try the values of each tile in.
+    :return: The solution found (None if there is none or the search was
+    stopped), whether the search finished, and the backtracks and
+    assignments it took.
+    """
+    board: SudokuBoard = SudokuBoard(rows)
+    search: BacktrackingSearch = BacktrackingSearch(
+        board, propagation, naked_pairs, order_values=order_values)
+    while not search.finished() and not _cancelled.is_set():
+        if search.run(SLICE_STEPS) is not None:
+            return (board_rows(board), True, search.stats.backtracks,
+                    search.stats.assignments)
+    return (None, search.finished(), search.stats.backtracks,
+            search.stats.assignments)
+
+
+def _fill_in(board: SudokuBoard,
+             solution: Optional[Rows]) -> Optional[SudokuBoard]:
+    """
+    Assigns the values of a solution to a board's unassigned tiles.
+    :param board: The board.
+    :param solution: The solution, or None if there is none.
+    :return: The solved board, or None if there is no solution.
+    """
+    if solution is None:
+        return None
+    size: int = board.size()
+    for tile in board.all_tiles():  # type: SudokuTile
+        if tile.value() == 0:
+            board.assign(tile, solution[tile.index() // size]
+                         [tile.index() % size])
+    return board
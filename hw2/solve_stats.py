@@ -0,0 +1,60 @@
+import time
+from typing import Any, Dict
+
+
+class SolveStats:
+    """
+    Collects statistics about a single solve. Every solver takes an optional
+    SolveStats and counts into it, so solves running at the same time (in
+    threads, say) each keep their own counts:
+
+    backtracks: The number of times the search ran out of values to try for
+    a tile (or propagation ran into a contradiction) and had to back up.
+    assignments: The number of values assigned to tiles, by choice or by
+    propagation.
+    seconds: How long the solve took, once it has finished.
+    """
+
+    def __init__(self):
+        """
+        Initializes the statistics.
+        """
+        self.backtracks: int = 0
+        self.assignments: int = 0
+        self.seconds: float = 0.0
+        self._started: float = 0.0
+
+    def start(self) -> None:
+        """
+        Marks the start of the solve.
+        :return: None.
+        """
+        self._started = time.perf_counter()
+
+    def finish(self) -> None:
+        """
+        Marks the end of the solve. A solve that is paused and resumed can be
+        started and finished more than once, and the times add up.
+        :return: None.
+        """
+        self.seconds += time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Gets the statistics as a dictionary, for writing out as JSON.
+        :return: The statistics.
+        """
+        return {
+            'seconds': round(self.seconds, 6),
+            'backtracks': self.backtracks,
+            'assignments': self.assignments,
+        }
+
+    def __str__(self) -> str:
+        """
+        Produces a string output of the statistics.
+        :return: The string output of the statistics.
+        """
+        return ('The number of times this algorithm backtracked is: {}.\n'
+                'The number of times this algorithm assigned a value to a '
+                'variable is: {}.'.format(self.backtracks, self.assignments))
@@ -1,88 +1,200 @@
-from sudoku_tile import SudokuTile
-from typing import Set, List
+from sudoku_tile import SudokuTile, TileValues
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class _Layout:
+    """
+    Which tiles are in each row, column and box of a board, and which masks
+    and peers each tile has. The same for every board of a given size.
+    """
+
+    def __init__(self, box_size: int):
+        """
+        Works out the layout of a board.
+        :param box_size: Both the length and width of a box within the board.
+        """
+        size: int = box_size * box_size
+        # The tile numbers in each row, then each column, then each box.
+        self.units: List[List[int]] = [[] for _ in range(3 * size)]
+        # The indices of the masks of the row, column and box of each tile,
+        # and of the tile's own mask of ruled out values.
+        self.tile_masks: List[Tuple[int, int, int, int]] = []
+        for i in range(size):
+            for j in range(size):
+                # Calculating which box this tile is in.
+                box: int = (i // box_size) * box_size + j // box_size
+                masks: Tuple[int, int, int, int] = \
+                    (i, size + j, 2 * size + box, 3 * size + i * size + j)
+                self.tile_masks.append(masks)
+                for unit in masks[:3]:  # type: int
+                    self.units[unit].append(i * size + j)
+
+        # The tiles in each unit, each with the indices of its masks.
+        self.unit_masks: List[List[Tuple[int, int, int, int, int]]] = \
+            [[(index, *self.tile_masks[index]) for index in unit]
+             for unit in self.units]
+
+        # The tiles sharing a row, column or box with each tile, each with
+        # the indices of its masks.
+        self.peers: List[List[Tuple[int, int, int, int, int]]] = []
+        for index, masks in enumerate(self.tile_masks):
+            peer_indices: Dict[int, None] = {}
+            for unit in masks[:3]:  # type: int
+                for peer in self.units[unit]:  # type: int
+                    if peer != index:
+                        peer_indices[peer] = None
+            self.peers.append([(peer, *self.tile_masks[peer])
+                               for peer in peer_indices])
 
 
 class SudokuBoard:
     """
     Represents a SudokuBoard full of {@link SudokuTiles}.
+
+    Boards can be any size that is the square of a box size: 9 by 9 (the
+    standard), 16 by 16, 25 by 25 and so on. Values are bits in arbitrary
+    precision ints, so the masks work the same way at every size.
+
+    The board is array backed: tiles are numbered in row major order, and
+    everything the search needs (the masks of used values, the number of
+    possible values of each tile, the unassigned tiles) is kept in flat lists
+    indexed by those numbers. The layout of the rows, columns and boxes is the
+    same for every board of a size, so it is worked out once per size.
+
+    The number of possible values of every unassigned tile is kept up to date
+    as tiles are assigned and unassigned (only the tiles sharing a row,
+    column or box with the changed tile can change), and the unassigned tiles
+    are kept in buckets by that number, so the tile with the minimum remaining
+    values is found without scanning the board. The unassigned tiles are also
+    kept in a sparse set: a dense list of tile numbers plus the position of
+    each tile in it, so a tile is removed by swapping it with the last one.
+
+    Every change to the board is recorded on a trail, so it can be undone back
+    to a mark taken earlier (see mark and undo) without copying anything.
+    Tiles must be unassigned in the opposite order they were assigned in.
     """
 
-    # Both the length and width of a Sudoku board.
+    # Both the length and width of a standard Sudoku board.
     BOARD_SIZE: int = 9
-    # Both the length and width of a box within the Sudoku board.
+    # Both the length and width of a box within a standard Sudoku board.
     BOX_SIZE: int = 3
 
+    # The layout of each size of board by box size, worked out the first time
+    # it is needed.
+    _layouts: Dict[int, _Layout] = {}
+
     def __init__(self, row_orientation: List[List[int]]):
         """
         Initializes the Sudoku board.
         :param row_orientation: The backing board for this SudokuBoard. Must be
-        a standard board as given in PS2.
+        a board as given in PS2, of any size that is the square of a box size.
         """
+        size: int = len(row_orientation)
+        box_size: int = int(round(size ** 0.5))
+        if size == 0 or box_size * box_size != size or \
+                any(len(row) != size for row in row_orientation):
+            raise ValueError('A Sudoku board must have n^2 rows of n^2 '
+                             'tiles, not {} rows.'.format(size))
+        self._size: int = size
+        self._box_size: int = box_size
+        self._values: TileValues = TileValues.of_size(size)
+        if box_size not in SudokuBoard._layouts:
+            SudokuBoard._layouts[box_size] = _Layout(box_size)
+        self._layout: _Layout = SudokuBoard._layouts[box_size]
+
+        # The masks of the values used in every row, column and box, followed
+        # by the masks of the values ruled out for each tile alone.
+        self._used: List[int] = [0] * (3 * size + size * size)
+        # Whether no two given tiles share a value in a row, column or box.
+        self._consistent: bool = True
         self._all_tiles: List[SudokuTile] = []
-        self._unassigned_tiles: List[SudokuTile] = []
-
-        # Board in column orientation
-        column_orientation: List[List[int]] = \
-            SudokuBoard.__column_orientation(row_orientation)
-
-        # Calculate the nine boxes
-        list_of_boxes_lists: List[List[int]] = []
-        for a in range(0, SudokuBoard.BOARD_SIZE, SudokuBoard.BOX_SIZE):
-            for i in range(0, SudokuBoard.BOARD_SIZE, SudokuBoard.BOX_SIZE):
-                temp: List[int] = []
-                list_of_boxes_lists.append(temp)
-                for j in range(0, SudokuBoard.BOX_SIZE):
-                    for k in range(0, SudokuBoard.BOX_SIZE):
-                        temp.append(row_orientation[j+a][k+i])
-
-        # Turn our lists of rows, columns, and boxes into sets for fast lookup.
-        # Although now that I think about it, I've heard that for small lists
-        # iterating through might actually be faster than using sets.. Oh well.
-        rows: List[Set[int]] = []
-        columns: List[Set[int]] = []
-        boxes: List[Set[int]] = []
-        for i in range(SudokuBoard.BOARD_SIZE):
-            rows.append({x for x in row_orientation[i] if x != 0})
-            columns.append({x for x in column_orientation[i] if x != 0})
-            boxes.append({x for x in list_of_boxes_lists[i] if x != 0})
-
-        # For each tile in give board.
-        for i in range(SudokuBoard.BOARD_SIZE):
-            for j in range(SudokuBoard.BOARD_SIZE):
+        for i in range(size):
+            for j in range(size):
                 # The tile's value
                 value: int = row_orientation[i][j]
-
-                # Calculating which box this tile is in.
-                index: int = \
-                    ((i // SudokuBoard.BOX_SIZE) * SudokuBoard.BOX_SIZE) + \
-                    (j // SudokuBoard.BOX_SIZE)
-
+                index: int = i * size + j
+                masks: Tuple[int, int, int, int] = \
+                    self._layout.tile_masks[index]
+                if value != 0:
+                    bit: int = 1 << (value - 1)
+                    if (self._used[masks[0]] | self._used[masks[1]] |
+                            self._used[masks[2]]) & bit:
+                        self._consistent = False
+                    self._used[masks[0]] |= bit
+                    self._used[masks[1]] |= bit
+                    self._used[masks[2]] |= bit
                 # Create a SudokuTile object and give it access to its row,
                 # column, box, and value.
-                tile: SudokuTile = SudokuTile(
-                    rows[i], columns[j], boxes[index], value)
+                self._all_tiles.append(
+                    SudokuTile(self._values, self._used, index, *masks,
+                               value))
 
-                # Given how we construct our board a value of 0 means that this
-                # is one of the tiles we will have to assign a value to.
-                if value == 0:
-                    self._unassigned_tiles.append(tile)
+        # Given how we construct our board a value of 0 means that this is one
+        # of the tiles we will have to assign a value to. The first
+        # _unassigned_count tile numbers in _unassigned are the unassigned
+        # tiles, and _positions gives the position of every tile in it.
+        self._unassigned: List[int] = \
+            [tile.index() for tile in self._all_tiles if tile.value() == 0]
+        self._unassigned_count: int = len(self._unassigned)
+        self._unassigned.extend(tile.index() for tile in self._all_tiles
+                                if tile.value() != 0)
+        self._positions: List[int] = [0] * (size * size)
+        for position, index in enumerate(self._unassigned):  # type: int, int
+            self._positions[index] = position
 
-                # Keep track of all tiles in the board
-                self._all_tiles.append(tile)
+        # The number of possible values of each unassigned tile (-1 for the
+        # assigned tiles), and the unassigned tiles by their number of
+        # possible values. The buckets are dicts used as insertion ordered
+        # sets.
+        self._counts: List[int] = [-1] * (size * size)
+        self._buckets: List[Dict[int, None]] = [{} for _ in range(size + 1)]
+        for index in self._unassigned[:self._unassigned_count]:  # type: int
+            count: int = self._all_tiles[index].number_of_possible_values()
+            self._counts[index] = count
+            self._buckets[count][index] = None
+
+        # The changes made to the board, oldest first: a tile number and -1
+        # if the tile was assigned, or a tile number and its own mask before
+        # values were ruled out for it.
+        self._trail: List[Tuple[int, int]] = []
+
+    def size(self) -> int:
+        """
+        Gets both the length and width of the board.
+        :return: The size of the board.
+        """
+        return self._size
+
+    def box_size(self) -> int:
+        """
+        Gets both the length and width of a box within the board.
+        :return: The size of a box.
+        """
+        return self._box_size
+
+    def consistent(self) -> bool:
+        """
+        Whether or not the given tiles follow the rules: no two of them share
+        a value in a row, column or box. A board that does not has no
+        solution, which the solvers report without searching.
+        :return: True if the given tiles follow the rules, false otherwise.
+        """
+        return self._consistent
 
     def complete(self) -> bool:
         """
         Whether or not the Sudoku board is completely filled in.
         :return: True if the Sudoku board is complete, false otherwise.
         """
-        return len(self._unassigned_tiles) == 0
+        return self._unassigned_count == 0
 
     def unassigned_tiles(self) -> List[SudokuTile]:
         """
         Returns the list of unassigned tiles.
         :return: The list of unassigned tiles.
         """
-        return self._unassigned_tiles
+        return [self._all_tiles[index]
+                for index in self._unassigned[:self._unassigned_count]]
 
     def assign(self, tile: SudokuTile, value: int) -> None:
         """
@@ -92,16 +204,32 @@ class SudokuBoard:
         :return: Nothing
         """
         tile.assign(value)
-        self._unassigned_tiles.remove(tile)
+        index: int = tile.index()
+        # Swap the tile with the last unassigned tile, and shrink the set.
+        unassigned: List[int] = self._unassigned
+        positions: List[int] = self._positions
+        self._unassigned_count -= 1
+        last: int = unassigned[self._unassigned_count]
+        position: int = positions[index]
+        unassigned[position] = last
+        positions[last] = position
+        unassigned[self._unassigned_count] = index
+        positions[index] = self._unassigned_count
+
+        del self._buckets[self._counts[index]][index]
+        self._counts[index] = -1
+        self._trail.append((index, -1))
+        self.__update_peers(index)
 
     def unassign(self, tile: SudokuTile) -> None:
         """
-        Unassigns the tile given.
+        Unassigns the tile given. It must be the last change made to the
+        board.
         :param tile: The tile to unassign a value.
         :return: Nothing
         """
-        tile.unassign()
-        self._unassigned_tiles.append(tile)
+        self._trail.pop()
+        self.__unassign(tile.index())
 
     def all_tiles(self) -> List[SudokuTile]:
         """
@@ -110,21 +238,199 @@ class SudokuBoard:
         """
         return self._all_tiles
 
-    def next_tile(self) -> SudokuTile:
+    def mark(self) -> int:
+        """
+        Marks the current state of the board so that every change made after
+        this can be undone.
+        :return: The mark to give to undo.
+        """
+        return len(self._trail)
+
+    def undo(self, mark: int) -> None:
+        """
+        Undoes every change made since the given mark, newest first.
+        :param mark: A mark returned by mark.
+        :return: Nothing
+        """
+        trail: List[Tuple[int, int]] = self._trail
+        while len(trail) > mark:
+            index, ruled_out = trail.pop()  # type: int, int
+            if ruled_out < 0:
+                self.__unassign(index)
+            else:
+                self._used[self._layout.tile_masks[index][3]] = ruled_out
+                self.__recount(index)
+
+    def propagate(self, naked_pairs: bool = False) -> Optional[int]:
+        """
+        Assigns every tile that constraint propagation can work out, until
+        nothing changes:
+
+        - Naked singles: a tile with only one possible value gets it.
+        - Hidden singles: a value that fits in only one tile of a row, column
+          or box goes there.
+        - Naked pairs (optional): two tiles of a row, column or box with the
+          same two possible values take both of them, so they are ruled out
+          for the other tiles of the row, column or box.
+
+        The possible values of a tile already follow from forward checking,
+        so they are always arc consistent (AC-3 would remove nothing more).
+        Everything propagation does is recorded on the trail, including when
+        it finds a contradiction, so take a mark first and undo to it.
+        :param naked_pairs: Whether to look for naked pairs.
+        :return: The number of tiles assigned, or None if some tile has no
+        possible values left or some value fits nowhere in a row, column or
+        box.
+        """
+        tiles: List[SudokuTile] = self._all_tiles
+        counts: List[int] = self._counts
+        used: List[int] = self._used
+        all_values: int = self._values.all_values
+        units: List[List[int]] = self._layout.units
+        unit_masks: List[List[Tuple[int, int, int, int, int]]] = \
+            self._layout.unit_masks
+        assigned: int = 0
+        changed: bool = True
+        while changed:
+            changed = False
+            if self._buckets[0]:
+                return None
+            # Naked singles.
+            while self._buckets[1]:
+                tile: SudokuTile = tiles[next(iter(self._buckets[1]))]
+                self.assign(tile, tile.possible_values()[0])
+                assigned += 1
+                changed = True
+                if self._buckets[0]:
+                    return None
+            # Hidden singles.
+            for unit_index, unit in enumerate(unit_masks):
+                once: int = 0
+                twice: int = 0
+                for index, row, column, box, ruled_out in unit:
+                    if counts[index] >= 0:
+                        # The same as tiles[index].candidates(), inlined
+                        # since this runs after every assignment.
+                        candidates: int = all_values & \
+                            ~(used[row] | used[column] | used[box] |
+                              used[ruled_out])
+                        twice |= once & candidates
+                        once |= candidates
+                if all_values & ~(used[unit_index] | once):
+                    return None
+                singles: int = once & ~twice
+                while singles:
+                    bit: int = singles & -singles
+                    singles ^= bit
+                    for index in units[unit_index]:  # type: int
+                        if counts[index] >= 0 and \
+                                tiles[index].candidates() & bit:
+                            self.assign(tiles[index], bit.bit_length())
+                            assigned += 1
+                            changed = True
+                            break
+                if self._buckets[0]:
+                    return None
+            if naked_pairs and not changed:
+                changed = self.__naked_pairs()
+        return assigned
+
+    def next_tile(self) -> Optional[SudokuTile]:
+        """
+        Returns the next tile that should be assigned a value: the unassigned
+        tile with the fewest possible values.
+        :return: The next tile that should be assigned a value, or None if
+        every tile is assigned.
+        """
+        for bucket in self._buckets:  # type: Dict[int, None]
+            if bucket:
+                return self._all_tiles[next(iter(bucket))]
+        return None
+
+    def __naked_pairs(self) -> bool:
+        """
+        Rules out the values of every naked pair for the other tiles of the
+        row, column or box it is in.
+        :return: True if any value was ruled out, false otherwise.
+        """
+        tiles: List[SudokuTile] = self._all_tiles
+        counts: List[int] = self._counts
+        changed: bool = False
+        for unit in self._layout.units:  # type: List[int]
+            pairs: Dict[int, int] = {}
+            for index in unit:  # type: int
+                if counts[index] != 2:
+                    continue
+                candidates: int = tiles[index].candidates()
+                if candidates not in pairs:
+                    pairs[candidates] = index
+                    continue
+                for other in unit:  # type: int
+                    if other == index or other == pairs[candidates] or \
+                            counts[other] < 0 or \
+                            not tiles[other].candidates() & candidates:
+                        continue
+                    ruled_out: int = self._layout.tile_masks[other][3]
+                    self._trail.append((other, self._used[ruled_out]))
+                    self._used[ruled_out] |= candidates
+                    self.__recount(other)
+                    changed = True
+        return changed
+
+    def __unassign(self, index: int) -> None:
         """
-        Returns the next tile that should be assigned a value.
-        :return: The next tile that should be assigned a value.
+        Unassigns a tile, putting it back at the end of the unassigned tiles.
+        :param index: The number of the tile.
+        :return: Nothing
         """
-        # Since the largest number of possibilities any tile could have is 9
-        # we are fine to ust choose an arbitrarily larger starting minimum.
-        min_possibilities: int = 99
-        min_tile = None
-        for current_tile in self.unassigned_tiles():  # type: SudokuTile
-            current_possibilities: int = len(current_tile.possible_values())
-            if current_possibilities < min_possibilities:
-                min_possibilities = current_possibilities
-                min_tile = current_tile
-        return min_tile
+        tile: SudokuTile = self._all_tiles[index]
+        tile.unassign()
+        # The tile was swapped to just past the unassigned tiles when it was
+        # assigned, and everything assigned after it has been unassigned.
+        self._unassigned_count += 1
+        count: int = tile.number_of_possible_values()
+        self._counts[index] = count
+        self._buckets[count][index] = None
+        self.__update_peers(index)
+
+    def __update_peers(self, index: int) -> None:
+        """
+        Recounts the possible values of the unassigned tiles that share a row,
+        column or box with the given tile after it changed.
+        :param index: The number of the tile that was assigned or unassigned.
+        :return: Nothing
+        """
+        counts: List[int] = self._counts
+        buckets: List[Dict[int, None]] = self._buckets
+        used: List[int] = self._used
+        value_count: Sequence[int] = self._values.value_count
+        all_values: int = self._values.all_values
+        for peer, row, column, box, ruled_out in self._layout.peers[index]:
+            old_count: int = counts[peer]
+            if old_count < 0:
+                continue
+            # The same as peer.number_of_possible_values(), inlined since
+            # this is the inner loop of the search.
+            new_count: int = value_count[
+                all_values & ~(used[row] | used[column] | used[box] |
+                               used[ruled_out])]
+            if new_count != old_count:
+                del buckets[old_count][peer]
+                buckets[new_count][peer] = None
+                counts[peer] = new_count
+
+    def __recount(self, index: int) -> None:
+        """
+        Recounts the possible values of an unassigned tile.
+        :param index: The number of the tile to recount.
+        :return: Nothing
+        """
+        old_count: int = self._counts[index]
+        new_count: int = self._all_tiles[index].number_of_possible_values()
+        if new_count != old_count:
+            del self._buckets[old_count][index]
+            self._buckets[new_count][index] = None
+            self._counts[index] = new_count
 
     def __str__(self) -> str:
         """
@@ -133,24 +439,8 @@ class SudokuBoard:
         """
         string_rep = ""
         for index, tile in enumerate(self._all_tiles):
-            if index % SudokuBoard.BOARD_SIZE == 0:
+            if index % self._size == 0:
                 string_rep += '\n'
             string_rep += str(tile) + ','
 
         return string_rep
-
-    @staticmethod
-    def __column_orientation(row_orientation):
-        """
-        Takes a board in row orientation and returns a board in column
-        orientation.
-        :param row_orientation: The board to make into a column oriented board.
-        :return: The column oriented board.
-        """
-        column_orientation: List[List[int]] = []
-        for i in range(len(row_orientation)):
-            column: List[int] = []
-            column_orientation.append(column)
-            for row in row_orientation:
-                column.append(row[i])
-        return column_orientation
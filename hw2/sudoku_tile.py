@@ -1,13 +1,134 @@
-from typing import Set, List
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# The symbols values are written with: value v is written as SYMBOLS[v - 1],
+# so boards up to 25 by 25 can be written one character per tile.
+SYMBOLS: str = '123456789ABCDEFGHIJKLMNOP'
+
+# Boards up to this size get full tables indexed by mask. Larger boards have
+# too many masks, so their values are worked out when needed.
+TABLE_SIZE_LIMIT: int = 16
+# The most masks whose values are kept for boards too large for a table. The
+# lookups are shared by every board of a size, so they must not grow without
+# bound over a long run.
+MASK_CACHE_SIZE: int = 4096
+
+
+class _ValuesInMask:
+    """
+    Works out the values in a mask, in increasing order, for boards too large
+    for a table. Indexed like the table it stands in for. The values of the
+    most recently used masks are kept, up to MASK_CACHE_SIZE of them.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initializes the lookup.
+        :param size: The number of values.
+        """
+        self._size: int = size
+        self._cached: Callable[[int], Tuple[int, ...]] = \
+            lru_cache(maxsize=MASK_CACHE_SIZE)(self._values)
+
+    def __getitem__(self, mask: int) -> Tuple[int, ...]:
+        """
+        Gets the values in a mask.
+        :param mask: The mask.
+        :return: The values in the mask, in increasing order.
+        """
+        return self._cached(mask)
+
+    def _values(self, mask: int) -> Tuple[int, ...]:
+        """
+        Works out the values in a mask, without the cache.
+        :param mask: The mask.
+        :return: The values in the mask, in increasing order.
+        """
+        return tuple(x for x in range(1, self._size + 1)
+                     if mask >> (x - 1) & 1)
+
+
+class _ValueCount:
+    """
+    Counts the values in a mask for boards too large for a table. Indexed like
+    the table it stands in for.
+    """
+
+    def __getitem__(self, mask: int) -> int:
+        """
+        Counts the values in a mask.
+        :param mask: The mask.
+        :return: The number of values in the mask.
+        """
+        return bin(mask).count('1')
+
+
+class TileValues:
+    """
+    The values the tiles of a board of a given size can take on, and lookups
+    for masks of them. Shared by every board of that size.
+    """
+
+    # The values of each size, built the first time they are needed.
+    _of_size: Dict[int, 'TileValues'] = {}
+
+    def __init__(self, size: int):
+        """
+        Initializes the values. Use of_size to share them between boards.
+        :param size: Both the length and width of the board.
+        """
+        # The universe of possible values a Sudoku tile could take on.
+        self.universe: List[int] = list(range(1, size + 1))
+        # The mask with every value set.
+        self.all_values: int = (1 << size) - 1
+        # The values in each mask, and the number of values in each mask.
+        if size == 9:
+            # The values are listed in the order a set of the same values
+            # iterates in, which is the order the values of the original 9 by
+            # 9 solver were tried in, so the search still makes the same
+            # choices.
+            self.values_in_mask: Sequence[Tuple[int, ...]] = [
+                tuple({x for x in self.universe if mask >> (x - 1) & 1})
+                for mask in range(1 << size)]
+        elif size <= TABLE_SIZE_LIMIT:
+            # Built by doubling: the masks with x as their largest value are
+            # the masks before them with x added on the end.
+            table: List[Tuple[int, ...]] = [()]
+            for x in self.universe:  # type: int
+                table += [values + (x,) for values in table]
+            self.values_in_mask = table
+        else:
+            self.values_in_mask = _ValuesInMask(size)
+        if size <= TABLE_SIZE_LIMIT:
+            self.value_count: Sequence[int] = \
+                [len(values) for values in self.values_in_mask]
+        else:
+            self.value_count = _ValueCount()
+
+    @staticmethod
+    def of_size(size: int) -> 'TileValues':
+        """
+        Gets the values of a board of the given size.
+        :param size: Both the length and width of the board.
+        :return: The values.
+        """
+        values: TileValues = TileValues._of_size.get(size)
+        if values is None:
+            values = TileValues(size)
+            TileValues._of_size[size] = values
+        return values
 
 
 class SudokuTile:
     """
     Represents an individual tile that can hold a value in a Sudoku board.
-    """
 
-    # The universe of possible values a Sudoku tile could take on.
-    UNIVERSE_OF_TILE_VALUES: List[int] = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+    The values already used in each row, column and box are kept as bit
+    masks, where bit (value - 1) is set if the value is used, so the possible
+    values of a tile are a couple of bitwise operations away. The masks are
+    shared by every tile in the board. Each tile also has a mask of its own,
+    of the values constraint propagation has ruled out for it alone.
+    """
 
     # Colors
     C_BLUE = '\u001b[34m'
@@ -15,34 +136,76 @@ class SudokuTile:
     C_END = '\033[0m'
 
     def __init__(self,
-                 row: Set[int],
-                 column: Set[int],
-                 box: Set[int],
+                 values: TileValues,
+                 used: List[int],
+                 index: int,
+                 row: int,
+                 column: int,
+                 box: int,
+                 ruled_out: int,
                  value: int):
         """
         Initializes the SudokuTile by assigning a value (0 if none), and giving
         the tile access to its row, column, and surrounding box.
-        :param row: The row this tile resides in.
-        :param column: The column this tile resides in.
-        :param box: The box this tile resides in.
+        :param values: The values of the board's size.
+        :param used: The masks of the values used in every row, column and
+        box of the board.
+        :param index: The number of this tile in the board, in row major
+        order.
+        :param row: The index in used of the row this tile resides in.
+        :param column: The index in used of the column this tile resides in.
+        :param box: The index in used of the box this tile resides in.
+        :param ruled_out: The index in used of the mask of values ruled out
+        for this tile alone.
         :param value: The value of this tile (0 if none).
         """
-        self._row: Set[int] = row
-        self._column: Set[int] = column
-        self._box: Set[int] = box
+        self._values: TileValues = values
+        self._used: List[int] = used
+        self._index: int = index
+        self._row: int = row
+        self._column: int = column
+        self._box: int = box
+        self._ruled_out: int = ruled_out
         self._value: int = value
         self._color: str = SudokuTile.C_BLUE if value != 0 else SudokuTile.C_RED
 
-    def possible_values(self) -> Set[int]:
+    def candidates(self) -> int:
+        """
+        Gets the mask of the possible values this tile could take on.
+        :return: The mask of the possible values. Can be 0.
+        """
+        used: List[int] = self._used
+        return self._values.all_values & \
+            ~(used[self._row] | used[self._column] | used[self._box] |
+              used[self._ruled_out])
+
+    def possible_values(self) -> Tuple[int, ...]:
         """
         Gets all of the possible values this tile could take on.
-        :return: The set of possible values this tile could take on. Can be
-        empty.
+        :return: The possible values this tile could take on. Can be empty.
         """
-        return {x for x in SudokuTile.UNIVERSE_OF_TILE_VALUES if
-                (x not in self._row) and
-                (x not in self._column) and
-                (x not in self._box)}
+        return self._values.values_in_mask[self.candidates()]
+
+    def number_of_possible_values(self) -> int:
+        """
+        Gets the number of possible values this tile could take on.
+        :return: The number of possible values.
+        """
+        return self._values.value_count[self.candidates()]
+
+    def index(self) -> int:
+        """
+        Gets the number of this tile in the board, in row major order.
+        :return: The number of this tile.
+        """
+        return self._index
+
+    def value(self) -> int:
+        """
+        Gets the value of this tile.
+        :return: The value of this tile (0 if none).
+        """
+        return self._value
 
     def assign(self, value: int) -> None:
         """
@@ -51,23 +214,36 @@ class SudokuTile:
         :return: Nothing.
         """
         self._value = value
-        self._row.add(value)
-        self._column.add(value)
-        self._box.add(value)
+        bit: int = 1 << (value - 1)
+        used: List[int] = self._used
+        used[self._row] |= bit
+        used[self._column] |= bit
+        used[self._box] |= bit
 
     def unassign(self) -> None:
         """
         Unassigns the current value of this tile.
         :return: Nothing.
         """
-        self._row.remove(self._value)
-        self._column.remove(self._value)
-        self._box.remove(self._value)
+        bit: int = ~(1 << (self._value - 1))
+        used: List[int] = self._used
+        used[self._row] &= bit
+        used[self._column] &= bit
+        used[self._box] &= bit
         self._value = 0
 
+    def symbol(self) -> str:
+        """
+        Gets the symbol the tile's value is written with (see SYMBOLS).
+        :return: The symbol, 0 if the tile is unassigned.
+        """
+        if 0 < self._value <= len(SYMBOLS):
+            return SYMBOLS[self._value - 1]
+        return str(self._value)
+
     def __str__(self) -> str:
         """
         Returns the string representation of the tile.
         :return: The string representation of the tile.
         """
-        return self._color + str(self._value) + SudokuTile.C_END
+        return self._color + self.symbol() + SudokuTile.C_END
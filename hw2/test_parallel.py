@@ -0,0 +1,75 @@
+import multiprocessing
+import unittest
+import parallel
+from main import DEAD_END_BOARD
+from parallel import Rows, WorkerResult
+from solve_stats import SolveStats
+from sudoku_board import SudokuBoard
+from typing import Callable, List, Optional
+
+# The number of worker processes each search is spread over.
+WORKERS: int = 2
+
+
+class TestDeadEnd(unittest.TestCase):
+    """
+    Checks that the parallel solvers prove a board with no duplicate givens
+    has no solution by searching every choice, and shut their workers down
+    afterwards.
+    """
+
+    def test_branches(self) -> None:
+        """
+        Checks that every subproblem the board is split into is searched to
+        the end without finding a solution.
+        :return: None.
+        """
+        stats: SolveStats = SolveStats()
+        solution, subproblems = parallel.split(
+            parallel.board_rows(SudokuBoard(DEAD_END_BOARD)),
+            WORKERS * parallel.SUBPROBLEMS_PER_WORKER, True, False, stats)
+        self.assertIsNone(solution)
+        self.assertGreater(len(subproblems), 1)
+        parallel._start_worker(multiprocessing.Event())
+        for subproblem in subproblems:  # type: Rows
+            result: WorkerResult = parallel._search(subproblem, True, False,
+                                                    None)
+            self.assertIsNone(result[0])
+            self.assertTrue(result[1])
+
+    def test_parallel(self) -> None:
+        """
+        Checks that splitting the search finds no solution.
+        :return: None.
+        """
+        self.check(parallel.parallel_backtracking)
+
+    def test_portfolio(self) -> None:
+        """
+        Checks that racing value orderings finds no solution.
+        :return: None.
+        """
+        self.check(parallel.portfolio_backtracking)
+
+    def check(self, solver: Callable[..., Optional[SudokuBoard]]) -> None:
+        """
+        Checks that a parallel solver searches the board, finds no solution,
+        leaves the board as it was given and stops all of its workers.
+        :param solver: The parallel solver.
+        :return: None.
+        """
+        board: SudokuBoard = SudokuBoard(DEAD_END_BOARD)
+        self.assertTrue(board.consistent())
+        stats: SolveStats = SolveStats()
+        answer: Optional[SudokuBoard] = solver(board, workers=WORKERS,
+                                               stats=stats)
+        self.assertIsNone(answer)
+        self.assertGreater(stats.backtracks, 0)
+        self.assertEqual(parallel.board_rows(board), DEAD_END_BOARD)
+        children: List[multiprocessing.Process] = \
+            multiprocessing.active_children()
+        self.assertEqual(children, [])
+
+
+if __name__ == '__main__':
+    unittest.main()